@@ -0,0 +1,61 @@
+"""add search indexes on items.name
+
+Revision ID: 0006_add_items_name_search_index
+Revises: 0005_seed_items
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_add_items_name_search_index"
+down_revision = "0005_seed_items"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        # SQLite and others: plain btree index (the ORM declares `index=True` on name)
+        op.create_index("ix_items_name", "items", ["name"])
+        return
+
+    # Build indexes CONCURRENTLY so writes to a large items table aren't blocked;
+    # that requires running outside the migration transaction.
+    with op.get_context().autocommit_block():
+        # pg_trgm needs CREATE privilege on the database (superuser on managed Postgres may be required)
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_items_name",
+            "items",
+            ["name"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # trigram GIN index serves both prefix and substring (I)LIKE and similarity() ranking
+        op.create_index(
+            "ix_items_name_trgm",
+            "items",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        op.drop_index("ix_items_name", table_name="items")
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_items_name_trgm", table_name="items", postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            "ix_items_name", table_name="items", postgresql_concurrently=True, if_exists=True
+        )
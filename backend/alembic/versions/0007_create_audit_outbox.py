@@ -0,0 +1,32 @@
+"""create audit_outbox table
+
+Revision ID: 0007_create_audit_outbox
+Revises: 0006_add_items_name_search_index
+Create Date: 2026-10-17 00:10:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007_create_audit_outbox"
+down_revision = "0006_add_items_name_search_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Transactional outbox for audit records (AUDIT_OUTBOX_ENABLED); rows are short-lived,
+    # so only the primary key is indexed (the relay reads in id order).
+    op.create_table(
+        "audit_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("record", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()")
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("audit_outbox")
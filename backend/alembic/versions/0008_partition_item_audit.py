@@ -0,0 +1,119 @@
+"""partition item_audit by created_at
+
+Revision ID: 0008_partition_item_audit
+Revises: 0007_create_audit_outbox
+Create Date: 2026-10-17 00:20:00.000000
+"""
+
+from datetime import datetime, timezone
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.config import settings
+from app.services import audit_partitions
+
+# revision identifiers, used by Alembic.
+revision = "0008_partition_item_audit"
+down_revision = "0007_create_audit_outbox"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ("ix_item_audit_user_id", "user_id"),
+    ("ix_item_audit_ip", "ip"),
+    ("ix_item_audit_method", "method"),
+    ("ix_item_audit_created_at", "created_at"),
+)
+
+_COLUMNS = "id, item_id, action, payload, user_id, ip, method, user_agent, request_path"
+
+
+def _create_table_sql(partitioned: bool) -> str:
+    # partitioned tables need the partition key in the primary key
+    pk = "PRIMARY KEY (id, created_at)" if partitioned else "PRIMARY KEY (id)"
+    suffix = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    return f"""
+        CREATE TABLE item_audit (
+          id integer NOT NULL DEFAULT nextval('item_audit_id_seq'),
+          item_id integer,
+          action varchar(50) NOT NULL,
+          payload json,
+          created_at timestamptz NOT NULL DEFAULT now(),
+          user_id varchar(128),
+          ip varchar(45),
+          method varchar(16),
+          user_agent text,
+          request_path varchar(512),
+          {pk}
+        ){suffix}
+    """
+
+
+def _swap_out_current_table():
+    # keep the id sequence; it is re-owned by the new table below
+    op.execute("ALTER TABLE item_audit ALTER COLUMN id DROP DEFAULT")
+    op.execute("ALTER SEQUENCE item_audit_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE item_audit RENAME TO item_audit_old")
+    op.execute("ALTER TABLE item_audit_old RENAME CONSTRAINT item_audit_pkey TO item_audit_old_pkey")
+    for name, _column in _INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_old")
+
+
+def _finish_new_table():
+    op.execute("ALTER SEQUENCE item_audit_id_seq OWNED BY item_audit.id")
+    for name, column in _INDEXES:
+        # on a partitioned parent this cascades to every current and future partition
+        op.execute(f"CREATE INDEX {name} ON item_audit ({column})")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        # declarative partitioning is Postgres-only; other backends keep the plain table
+        return
+
+    interval = getattr(settings, "AUDIT_PARTITION_INTERVAL", "month")
+    ahead = getattr(settings, "AUDIT_PARTITION_PREMAKE", 3)
+
+    _swap_out_current_table()
+    op.execute(_create_table_sql(partitioned=True))
+    _finish_new_table()
+    # catches rows outside every managed range; should stay empty while the
+    # maintenance command keeps partitions pre-created
+    op.execute(f"CREATE TABLE {audit_partitions.DEFAULT_PARTITION} PARTITION OF item_audit DEFAULT")
+
+    # one partition per period from the oldest row through `ahead` periods from now;
+    # offline (--sql) there is nothing to query, so older rows go to the default partition
+    today = datetime.now(timezone.utc).date()
+    oldest = None
+    if not context.is_offline_mode():
+        oldest = conn.execute(
+            sa.text("SELECT (min(created_at) AT TIME ZONE 'UTC')::date FROM item_audit_old")
+        ).scalar()
+    last = audit_partitions.shift_period(audit_partitions.period_start(today, interval), interval, ahead)
+    for start in audit_partitions.partition_periods(oldest or today, last, interval):
+        op.execute(audit_partitions.create_partition_sql(start, interval))
+
+    # one pass over history; run in a maintenance window on large tables
+    op.execute(
+        f"INSERT INTO item_audit ({_COLUMNS}, created_at) "
+        f"SELECT {_COLUMNS}, COALESCE(created_at, now()) FROM item_audit_old"
+    )
+    op.execute("DROP TABLE item_audit_old")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    _swap_out_current_table()
+    op.execute(_create_table_sql(partitioned=False))
+    _finish_new_table()
+    op.execute(
+        f"INSERT INTO item_audit ({_COLUMNS}, created_at) "
+        f"SELECT {_COLUMNS}, created_at FROM item_audit_old"
+    )
+    # drops the partitions with the parent
+    op.execute("DROP TABLE item_audit_old")
@@ -0,0 +1,42 @@
+"""add composite item_audit indexes for filtered keyset queries
+
+Revision ID: 0009_add_item_audit_keyset_indexes
+Revises: 0008_partition_item_audit
+Create Date: 2026-10-17 00:30:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0009_add_item_audit_keyset_indexes"
+down_revision = "0008_partition_item_audit"
+branch_labels = None
+depends_on = None
+
+# GET /audit filters on one typed column and pages by (created_at, id); these serve
+# both the filter and the order, so a page never sorts or scans past its limit.
+# The single-column user_id/ip/created_at indexes are prefixes of these and are replaced.
+_REPLACED = (
+    ("ix_item_audit_user_id", ["user_id"], "ix_item_audit_user_id_created_at", ["user_id", "created_at", "id"]),
+    ("ix_item_audit_ip", ["ip"], "ix_item_audit_ip_created_at", ["ip", "created_at", "id"]),
+    ("ix_item_audit_created_at", ["created_at"], "ix_item_audit_created_at_id", ["created_at", "id"]),
+)
+_ADDED = (
+    ("ix_item_audit_item_id_created_at", ["item_id", "created_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    for old_name, _old_columns, new_name, new_columns in _REPLACED:
+        op.create_index(new_name, "item_audit", new_columns)
+        op.drop_index(old_name, table_name="item_audit")
+    for name, columns in _ADDED:
+        op.create_index(name, "item_audit", columns)
+
+
+def downgrade() -> None:
+    for name, _columns in _ADDED:
+        op.drop_index(name, table_name="item_audit")
+    for old_name, old_columns, new_name, _new_columns in _REPLACED:
+        op.create_index(old_name, "item_audit", old_columns)
+        op.drop_index(new_name, table_name="item_audit")
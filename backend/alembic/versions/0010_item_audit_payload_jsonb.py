@@ -0,0 +1,56 @@
+"""convert item_audit.payload to JSONB and index it
+
+Revision ID: 0010_item_audit_payload_jsonb
+Revises: 0009_add_item_audit_keyset_indexes
+Create Date: 2026-10-17 00:40:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+
+# revision identifiers, used by Alembic.
+revision = "0010_item_audit_payload_jsonb"
+down_revision = "0009_add_item_audit_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        # JSONB is Postgres-only; other backends keep JSON
+        return
+
+    # rewrites every partition once; run in a maintenance window on large tables
+    op.alter_column(
+        "item_audit",
+        "payload",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        postgresql_using="payload::jsonb",
+    )
+    if getattr(settings, "AUDIT_PAYLOAD_GIN_INDEX", True):
+        # jsonb_path_ops: smaller index serving containment (payload @> '{...}') lookups
+        op.create_index(
+            "ix_item_audit_payload_gin",
+            "item_audit",
+            ["payload"],
+            postgresql_using="gin",
+            postgresql_ops={"payload": "jsonb_path_ops"},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_item_audit_payload_gin")
+    op.alter_column(
+        "item_audit",
+        "payload",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        postgresql_using="payload::json",
+    )
@@ -101,9 +101,58 @@ if _USE_PYDANTIC:
 
         # Audit / app-specific
         FORBIDDEN_WORDS: List[str] = Field(default_factory=list)
+        # Forbidden-word matcher (see app/services/forbidden_words.py)
+        FORBIDDEN_WORDS_FILE: str = ""
+        FORBIDDEN_WORDS_MATCH: str = "substring"  # substring | word
+        FORBIDDEN_WORDS_NORMALIZE: bool = False
+        FORBIDDEN_WORDS_RELOAD_S: float = 0.0
         VALIDATION_RULES: str = ""
+        # Body size caps for validated routes (413 when exceeded); 0 = unlimited
+        MAX_BODY_BYTES: int = 1048576
+        # per route/method overrides, e.g. "/items:POST=16384;/items/batch:POST=1048576"
+        BODY_SIZE_LIMITS: str = ""
         AUDIT_ENABLED: bool = True
+        # Audit policy (see app/services/audit_policy.py): full | metadata | off
+        AUDIT_POLICY: str = "full"
+        AUDIT_SAMPLE_RATE: float = 1.0
+        # per route/method sample rates, e.g. "/items:POST=0.1;*:POST=0.5"
+        AUDIT_SAMPLE_RULES: str = ""
         AUDIT_TABLE: str = "item_audit"
+        # In-process batched audit writer (see app/services/audit_queue.py)
+        AUDIT_QUEUE_ENABLED: bool = True
+        AUDIT_QUEUE_MAX_SIZE: int = 10000
+        AUDIT_QUEUE_BATCH_SIZE: int = 500
+        AUDIT_QUEUE_FLUSH_MS: int = 200
+        AUDIT_QUEUE_PUT_TIMEOUT_MS: int = 50
+        # Transactional outbox (see app/services/audit_outbox.py); takes precedence over the queue
+        AUDIT_OUTBOX_ENABLED: bool = False
+        AUDIT_OUTBOX_BATCH_SIZE: int = 1000
+        AUDIT_OUTBOX_RELAY_MS: int = 500
+        # item_audit partitioning on Postgres (see app/services/audit_partitions.py)
+        AUDIT_PARTITION_INTERVAL: str = "month"
+        AUDIT_PARTITION_PREMAKE: int = 3
+        AUDIT_PARTITION_RETENTION: int = 0
+        # Leave fields stored in typed columns (user_id, ip, ...) out of item_audit.payload
+        AUDIT_PAYLOAD_COMPACT: bool = False
+        # Create the GIN index on item_audit.payload in migration 0010 (Postgres)
+        AUDIT_PAYLOAD_GIN_INDEX: bool = True
+
+        # Items listing / pagination
+        ITEMS_PAGE_SIZE: int = 100
+        ITEMS_MAX_PAGE_SIZE: int = 1000
+        ITEMS_STREAM_BATCH_SIZE: int = 2000
+        ITEMS_BATCH_MAX_SIZE: int = 1000
+        ITEMS_COUNT_CACHE_TTL: float = 5.0
+
+        # Startup warm-up (see app/services/warmup.py); /ready is 503 until it finishes
+        WARMUP_ENABLED: bool = True
+        WARMUP_TIMEOUT_S: float = 30.0
+        WARMUP_RETRY_S: float = 5.0
+
+        # Audit query API (GET /audit); off by default, it exposes user ids, IPs and payloads
+        AUDIT_API_ENABLED: bool = False
+        AUDIT_PAGE_SIZE: int = 100
+        AUDIT_MAX_PAGE_SIZE: int = 1000
 
         # External services
         BROKER_URL: str = ""
@@ -181,6 +230,13 @@ if _USE_PYDANTIC:
             LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
             TESTING: bool = _env_bool("INTEGRATION_TEST", False)
             FORBIDDEN_WORDS: List[str] = _env_list("FORBIDDEN_WORDS", [])
+            ITEMS_PAGE_SIZE: int = int(os.getenv("ITEMS_PAGE_SIZE", "100"))
+            ITEMS_MAX_PAGE_SIZE: int = int(os.getenv("ITEMS_MAX_PAGE_SIZE", "1000"))
+            ITEMS_STREAM_BATCH_SIZE: int = int(os.getenv("ITEMS_STREAM_BATCH_SIZE", "2000"))
+            ITEMS_BATCH_MAX_SIZE: int = int(os.getenv("ITEMS_BATCH_MAX_SIZE", "1000"))
+            ITEMS_COUNT_CACHE_TTL: float = float(os.getenv("ITEMS_COUNT_CACHE_TTL", "5"))
+            AUDIT_PAGE_SIZE: int = int(os.getenv("AUDIT_PAGE_SIZE", "100"))
+            AUDIT_MAX_PAGE_SIZE: int = int(os.getenv("AUDIT_MAX_PAGE_SIZE", "1000"))
 
         settings = SimpleSettings()
     # normalize VALIDATION_RULES into a parsed list of (path, METHOD)
@@ -202,6 +258,13 @@ else:
         DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
         LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
         TESTING: bool = _env_bool("INTEGRATION_TEST", False)
+        ITEMS_PAGE_SIZE: int = int(os.getenv("ITEMS_PAGE_SIZE", "100"))
+        ITEMS_MAX_PAGE_SIZE: int = int(os.getenv("ITEMS_MAX_PAGE_SIZE", "1000"))
+        ITEMS_STREAM_BATCH_SIZE: int = int(os.getenv("ITEMS_STREAM_BATCH_SIZE", "2000"))
+        ITEMS_BATCH_MAX_SIZE: int = int(os.getenv("ITEMS_BATCH_MAX_SIZE", "1000"))
+        ITEMS_COUNT_CACHE_TTL: float = float(os.getenv("ITEMS_COUNT_CACHE_TTL", "5"))
+        AUDIT_PAGE_SIZE: int = int(os.getenv("AUDIT_PAGE_SIZE", "100"))
+        AUDIT_MAX_PAGE_SIZE: int = int(os.getenv("AUDIT_MAX_PAGE_SIZE", "1000"))
 
 
     settings = Settings()
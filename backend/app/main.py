@@ -1,8 +1,17 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
+from app.middleware.security import SecurityHeadersMiddleware
 from app.middleware.validation import ValidationMiddleware
+from app.routes import audit as audit_router
+from app.routes import health as health_router
 from app.routes import items as items_router
+from app.services.audit_outbox import OutboxRelay
+from app.services.audit_queue import AuditBatchWriter
+from app.services.warmup import warm_up_until_ready
+from app.services import forbidden_words
 import logging
 import logging.config
 import sys
@@ -38,8 +47,51 @@ LOGGING_CONFIG = {
 logging.config.dictConfig(LOGGING_CONFIG)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the audit outbox relay or the batched audit writer; routes fall back to
+    # direct inserts when neither is running
+    writer = None
+    relay = None
+    if getattr(settings, "AUDIT_OUTBOX_ENABLED", False):
+        relay = OutboxRelay.from_settings(settings)
+        await relay.start()
+    elif getattr(settings, "AUDIT_QUEUE_ENABLED", True):
+        writer = AuditBatchWriter.from_settings(settings)
+        await writer.start()
+    app.state.audit_writer = writer
+    app.state.audit_relay = relay
+
+    # /ready stays 503 until caches, pool and compiled statements are warm
+    app.state.ready = False
+    app.state.warmup_task = None
+    if getattr(settings, "WARMUP_ENABLED", True):
+        await warm_up_until_ready(
+            app,
+            timeout=getattr(settings, "WARMUP_TIMEOUT_S", 30.0),
+            retry_interval=getattr(settings, "WARMUP_RETRY_S", 5.0),
+        )
+    else:
+        app.state.ready = True
+    try:
+        yield
+    finally:
+        # report not-ready first so load balancers stop routing here while we drain
+        app.state.ready = False
+        if app.state.warmup_task is not None:
+            app.state.warmup_task.cancel()
+        # drain queued / staged audit records before the workers exit
+        if writer is not None:
+            await writer.close()
+        if relay is not None:
+            await relay.close()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(debug=settings.DEBUG, title=settings.PROJECT_NAME)
+    # fail at start-up on settings that would break every validated request
+    forbidden_words.check_settings()
+
+    app = FastAPI(debug=settings.DEBUG, title=settings.PROJECT_NAME, lifespan=lifespan)
 
     # Validation middleware applied early so requests are sanitized before route handlers
     app.add_middleware(ValidationMiddleware)
@@ -51,25 +103,23 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # pagination metadata must be readable by browser clients
+        expose_headers=["X-Next-Cursor", "Link", "ETag", "X-Total-Count"],
     )
 
     # Enforce HTTPS when configured (useful for production behind a proxy)
     if settings.FORCE_HTTPS:
         app.add_middleware(HTTPSRedirectMiddleware)
 
-    # Simple security headers middleware
-    @app.middleware("http")
-    async def set_security_headers(request: Request, call_next):
-        response = await call_next(request)
-        response.headers.setdefault("X-Frame-Options", "DENY")
-        response.headers.setdefault("X-Content-Type-Options", "nosniff")
-        response.headers.setdefault("Referrer-Policy", "no-referrer")
-        # Disable FLoC / interest-cohort
-        response.headers.setdefault("Permissions-Policy", "interest-cohort=()")
-        return response
+    # Security headers on every response (outermost, so error responses get them too)
+    app.add_middleware(SecurityHeadersMiddleware)
 
     # include routers
+    app.include_router(health_router.router)
     app.include_router(items_router.router)
+    # GET /audit returns user ids, IPs and payloads and has no auth of its own: opt-in only
+    if getattr(settings, "AUDIT_API_ENABLED", False):
+        app.include_router(audit_router.router)
 
     return app
 
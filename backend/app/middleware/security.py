@@ -0,0 +1,43 @@
+from typing import Iterable, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Added to every HTTP response unless the route already set the header
+DEFAULT_SECURITY_HEADERS: Tuple[Tuple[str, str], ...] = (
+    ("X-Frame-Options", "DENY"),
+    ("X-Content-Type-Options", "nosniff"),
+    ("Referrer-Policy", "no-referrer"),
+    # Disable FLoC / interest-cohort
+    ("Permissions-Policy", "interest-cohort=()"),
+)
+
+
+class SecurityHeadersMiddleware:
+    """Plain ASGI middleware adding security headers to each `http.response.start`.
+
+    Headers are encoded once at construction; nothing else about the request
+    or the response body is touched.
+    """
+
+    def __init__(self, app: ASGIApp, headers: Optional[Iterable[Tuple[str, str]]] = None):
+        self.app = app
+        self.headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in (headers if headers is not None else DEFAULT_SECURITY_HEADERS)
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                present = {name.lower() for name, _ in headers}
+                headers.extend(h for h in self.headers if h[0] not in present)
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
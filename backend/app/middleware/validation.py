@@ -1,12 +1,22 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request, HTTPException, status
+from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
 import json
-from typing import List, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-from app.utils import sanitize
+from pydantic import ValidationError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import schemas
+from app.services import forbidden_words
+from app.services.forbidden_words import ForbiddenWordMatcher
+from app.utils import sanitize, sanitize_many
 import app.config as conf
 
+try:
+    from pydantic import TypeAdapter
+except ImportError:  # pydantic v1
+    TypeAdapter = None  # type: ignore
+
 
 class _SettingsProxy:
     """Proxy object that delegates attribute access to `app.config.settings`.
@@ -78,83 +88,370 @@ def _get_config_from_settings() -> Tuple[List[str], List[Tuple[str, str]]]:
     return forbidden, rules
 
 
-class ValidationMiddleware(BaseHTTPMiddleware):
+# Used when no VALIDATION_RULES are configured, for backward compatibility
+DEFAULT_RULES = [("/items", "POST"), ("/items/batch", "POST")]
+
+# Trie key marking that a `*` pattern ends at this node
+_PREFIX_END = ""
+
+
+class RuleMatcher:
+    """(path, METHOD) rules compiled into per-method lookups.
+
+    Exact patterns go into a set per method; `*` patterns (plain string
+    prefixes) go into a character trie per method. `matches` therefore costs
+    one set lookup plus at most one trie walk of `len(path)` steps, however
+    many rules are configured.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, str]]):
+        self._exact: Dict[str, set] = {}
+        self._prefixes: Dict[str, dict] = {}
+        for pattern, method in rules:
+            if pattern.endswith("*"):
+                node = self._prefixes.setdefault(method, {})
+                for ch in pattern[:-1]:
+                    node = node.setdefault(ch, {})
+                node[_PREFIX_END] = True
+            else:
+                self._exact.setdefault(method, set()).add(pattern)
+
+    def matches(self, path: str, method: str) -> bool:
+        exact = self._exact.get(method)
+        if exact is not None and path in exact:
+            return True
+        node = self._prefixes.get(method)
+        if node is None:
+            return False
+        for ch in path:
+            if _PREFIX_END in node:
+                return True
+            node = node.get(ch)
+            if node is None:
+                return False
+        return _PREFIX_END in node
+
+
+# (settings object, VALIDATION_RULES value, compiled matcher)
+_rules_cache: Optional[tuple] = None
+
+
+def _rule_matcher() -> RuleMatcher:
+    """Return the compiled rule matcher for the current VALIDATION_RULES.
+
+    Compiled once per config snapshot: the cache is keyed on the identity of
+    the settings object and of its VALIDATION_RULES value, so assigning a new
+    value (or `monkeypatch.setattr` in tests) recompiles on the next request.
+    Values are not expected to be mutated in place.
+    """
+    global _rules_cache
+    s = getattr(conf, "settings", None)
+    raw = getattr(s, "VALIDATION_RULES", None)
+    cached = _rules_cache
+    if cached is not None and cached[0] is s and cached[1] is raw:
+        return cached[2]
+    _, rules = _get_config_from_settings()
+    matcher = RuleMatcher(rules or DEFAULT_RULES)
+    # the cache keeps `raw` alive, so its id can't be reused by a new value
+    _rules_cache = (s, raw, matcher)
+    return matcher
+
+
+def _resolve_forbidden(forbidden) -> ForbiddenWordMatcher:
+    if forbidden is None:
+        return forbidden_words.get_matcher()
+    if not isinstance(forbidden, ForbiddenWordMatcher):
+        return ForbiddenWordMatcher(forbidden)
+    return forbidden
+
+
+_NAME_LENGTH_ERROR = "`name` must be 1-100 characters long"
+
+
+def _item_name(data) -> Tuple[Optional[str], Optional[str]]:
+    """Return `(name, None)` for a well-formed item payload, or `(None, detail)`."""
+    if not isinstance(data, dict):
+        return None, "Item must be a JSON object"
+
+    name = data.get("name")
+    if not isinstance(name, str):
+        return None, "`name` is required and must be a string"
+    if not (1 <= len(name) <= 100):
+        return None, _NAME_LENGTH_ERROR
+    return name, None
+
+
+def _check_name(name_clean: str, forbidden: ForbiddenWordMatcher) -> Tuple[Optional[dict], Optional[str]]:
+    if not name_clean:
+        # e.g. a name made only of tags or whitespace
+        return None, _NAME_LENGTH_ERROR
+    if forbidden.find(name_clean) is not None:
+        return None, "Name contains forbidden content"
+    return {"name": name_clean}, None
+
+
+def validate_item_payload(
+    data, forbidden: Union[ForbiddenWordMatcher, Sequence[str], None] = None
+) -> Tuple[Optional[dict], Optional[str]]:
+    """Validate and sanitize one item payload.
+
+    Returns `(validated, None)` on success or `(None, detail)` describing the
+    first failed check. `forbidden` defaults to the configured forbidden-word
+    matcher (see app/services/forbidden_words.py); a plain list of words is
+    also accepted. Use `validate_item_payloads` for many payloads.
+    """
+    forbidden = _resolve_forbidden(forbidden)
+    name, error = _item_name(data)
+    if error is not None:
+        return None, error
+    return _check_name(sanitize(name), forbidden)
+
+
+def validate_item_payloads(
+    entries: Sequence, forbidden: Union[ForbiddenWordMatcher, Sequence[str], None] = None
+) -> List[Tuple[Optional[dict], Optional[str]]]:
+    """`validate_item_payload` for a batch, with one `sanitize_many` call for all names."""
+    forbidden = _resolve_forbidden(forbidden)
+    checked = [_item_name(entry) for entry in entries]
+    clean = iter(sanitize_many([name for name, error in checked if error is None]))
+    return [
+        (None, error) if error is not None else _check_name(next(clean), forbidden)
+        for name, error in checked
+    ]
+
+
+# parses and validates raw JSON bytes in one pydantic-core call
+_item_create_adapter = TypeAdapter(schemas.ItemCreate) if TypeAdapter is not None else None
+
+
+def _item_error(exc: ValidationError) -> str:
+    """Map the first pydantic error to the detail `validate_item_payload` would give."""
+    err = exc.errors()[0]
+    kind = str(err.get("type", ""))
+    if kind.startswith("json") or kind == "value_error.jsondecode":
+        return "Invalid JSON body"
+    if not err.get("loc") or kind in ("model_type", "dict_type", "type_error.dict"):
+        return "Item must be a JSON object"
+    if "too_short" in kind or "too_long" in kind or "length" in kind:
+        return _NAME_LENGTH_ERROR
+    return "`name` is required and must be a string"
+
+
+def parse_item_json(
+    body: bytes, forbidden: Union[ForbiddenWordMatcher, Sequence[str], None] = None
+) -> Tuple[Optional[schemas.ItemCreate], Optional[str]]:
+    """Parse, validate and sanitize one raw `POST /items` body in a single pass.
+
+    The bytes go straight to a cached `TypeAdapter(ItemCreate).validate_json`
+    (no `json.loads` / dict round trip); the name is then sanitized and checked
+    against the forbidden words. Returns `(item, None)` or `(None, detail)`
+    with the same details as `validate_item_payload`.
+    """
+    forbidden = _resolve_forbidden(forbidden)
+    body = body or b"{}"
+    try:
+        if _item_create_adapter is not None:
+            item = _item_create_adapter.validate_json(body)
+        else:
+            item = schemas.ItemCreate.parse_raw(body)
+    except ValidationError as exc:
+        return None, _item_error(exc)
+
+    name_clean = sanitize(item.name)
+    _, error = _check_name(name_clean, forbidden)
+    if error is not None:
+        return None, error
+    if name_clean != item.name:
+        # already validated: skip re-running the model validators
+        construct = getattr(schemas.ItemCreate, "model_construct", None) or schemas.ItemCreate.construct
+        item = construct(name=name_clean)
+    return item, None
+
+
+async def get_validated_item(request: Request) -> schemas.ItemCreate:
+    """Dependency returning the validated, sanitized `ItemCreate` for this request.
+
+    Uses the object `ValidationMiddleware` stored on `request.state`; when the
+    middleware isn't configured for the route, parses the body the same way.
+    """
+    item = getattr(request.state, "validated_item", None)
+    if item is None:
+        item, error = parse_item_json(await request.body())
+        if error is not None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    return item
+
+
+def _bad_request(detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": detail},
+    )
+
+
+def _too_large(limit: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        content={"detail": f"Request body must be at most {limit} bytes"},
+    )
+
+
+def _parse_body_limits(raw) -> Dict[Tuple[str, str], int]:
+    """Parse `path:METHOD=bytes;...` into {(path, METHOD): bytes}; bad entries are skipped."""
+    limits = {}
+    for part in str(raw or "").split(";"):
+        target, sep, value = part.strip().rpartition("=")
+        path, colon, method = target.rpartition(":")
+        if not sep or not colon or not path:
+            continue
+        try:
+            limits[(path.strip(), method.strip().upper())] = max(int(value), 0)
+        except ValueError:
+            continue
+    return limits
+
+
+# (BODY_SIZE_LIMITS value, parsed limits)
+_body_limits_cache: Tuple[object, Dict[Tuple[str, str], int]] = (None, {})
+
+
+def _body_limit(path: str, method: str) -> int:
+    """Body size limit in bytes for a validated request (0 = unlimited).
+
+    `BODY_SIZE_LIMITS` entries (`*` matches any path) take precedence over
+    `MAX_BODY_BYTES`.
+    """
+    global _body_limits_cache
+    raw = getattr(settings, "BODY_SIZE_LIMITS", "")
+    if _body_limits_cache[0] != raw:
+        _body_limits_cache = (raw, _parse_body_limits(raw))
+    limits = _body_limits_cache[1]
+    if limits:
+        for key in ((path, method), ("*", method)):
+            if key in limits:
+                return limits[key]
+    return int(getattr(settings, "MAX_BODY_BYTES", 0) or 0)
+
+
+def _content_length(scope: Scope) -> Optional[int]:
+    for name, value in scope.get("headers", ()):
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+async def _read_body(receive: Receive, limit: int = 0) -> bytes:
+    """Read the whole request body, raising `_BodyTooLarge` once more than `limit`
+    bytes (when > 0) have arrived, without waiting for the rest."""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            # client went away before sending the whole body
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if limit and size > limit:
+            raise _BodyTooLarge()
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay(body: Union[bytes, Callable[[], bytes]], receive: Receive) -> Receive:
+    """Return a `receive` that yields `body` once, then defers to the original (disconnects).
+
+    `body` may be a callable, called only if the app actually reads the body.
+    """
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            data = body() if callable(body) else body
+            return {"type": "http.request", "body": data, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+class ValidationMiddleware:
     """Middleware that centralizes input validation/sanitization for selected endpoints.
 
     Currently handles:
-    - POST /items : validates JSON body contains `name` (1-100 chars), sanitizes it,
-      checks forbidden words, and replaces the request body with the sanitized JSON
-      so downstream handlers receive the cleaned payload.
+    - POST /items : validates the raw body bytes in one pass (`parse_item_json`:
+      `name` is 1-100 chars, sanitized, free of forbidden words) and stores the
+      resulting `ItemCreate` on `request.state.validated_item`, where the route
+      picks it up through the `get_validated_item` dependency.
+    - POST /items/batch : the body is a JSON array; every element goes through the
+      same checks and the per-element `(validated, error)` results are stashed on
+      `request.state.validated_batch` so one bad item doesn't reject the batch.
+
+    Plain ASGI middleware: requests that don't match a rule are passed straight to
+    the app with the original `receive`, so their bodies are never buffered.
+    Matched bodies are capped by `MAX_BODY_BYTES` / `BODY_SIZE_LIMITS`: a larger
+    `Content-Length` is rejected with 413 before anything is read, and a body
+    that streams past the limit is rejected as soon as it does, before any
+    JSON parsing. Results are stored in `scope["state"]`, which backs
+    `request.state`.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        forbidden, rules = _get_config_from_settings()
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        # If no rules are configured, default to POST /items for backward compatibility
-        if not rules:
-            rules = [("/items", "POST")]
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # check if current request matches any rule
-        matched = False
-        path = request.url.path
-        method = request.method.upper()
-        for pattern, m in rules:
-            if m != method:
-                continue
-            if pattern.endswith("*"):
-                prefix = pattern[:-1]
-                if path.startswith(prefix):
-                    matched = True
-                    break
-            else:
-                if path == pattern:
-                    matched = True
-                    break
+        path = scope["path"]
+        method = scope["method"].upper()
+        if not _rule_matcher().matches(path, method):
+            await self.app(scope, receive, send)
+            return
 
-        if matched:
-            body_bytes = await request.body()
+        limit = _body_limit(path, method)
+        if limit:
+            declared = _content_length(scope)
+            if declared is not None and declared > limit:
+                await _too_large(limit)(scope, receive, send)
+                return
+        try:
+            body_bytes = await _read_body(receive, limit)
+        except _BodyTooLarge:
+            await _too_large(limit)(scope, receive, send)
+            return
+        state = scope.setdefault("state", {})
+        if path.endswith("/batch") and body_bytes.lstrip()[:1] == b"[":
             try:
-                data = json.loads(body_bytes) if body_bytes else {}
+                data = json.loads(body_bytes)
             except Exception:
-                return JSONResponse(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    content={"detail": "Invalid JSON body"},
-                )
-
-            name = data.get("name")
-            if not isinstance(name, str):
-                return JSONResponse(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    content={"detail": "`name` is required and must be a string"},
-                )
-            if not (1 <= len(name) <= 100):
-                return JSONResponse(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    content={"detail": "`name` must be 1-100 characters long"},
-                )
-
-            name_clean = sanitize(name)
-
-            low = name_clean.lower()
-            for fw in forbidden:
-                if fw and fw.lower() in low:
-                    return JSONResponse(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        content={"detail": "Name contains forbidden content"},
-                    )
-
-            validated = {"name": name_clean}
-
-            # Replace the request body so downstream dependencies (e.g., pydantic) parse the sanitized data
-            new_body = json.dumps(validated).encode()
-
-            async def receive() -> dict:
-                return {"type": "http.request", "body": new_body}
-
-            # Monkey-patch the receive function used by the request to supply the cleaned body
-            request._receive = receive
-            # Also stash validated data for handlers that prefer to read it directly
-            request.state.validated_json = validated
-
-        response = await call_next(request)
-        return response
+                await _bad_request("Invalid JSON body")(scope, receive, send)
+                return
+            max_size = getattr(settings, "ITEMS_BATCH_MAX_SIZE", 1000)
+            if len(data) > max_size:
+                await _bad_request(f"Batch must contain at most {max_size} items")(scope, receive, send)
+                return
+            state["validated_batch"] = validate_item_payloads(data)
+            await self.app(scope, _replay(body_bytes, receive), send)
+            return
+
+        item, error = parse_item_json(body_bytes)
+        if error is not None:
+            await _bad_request(error)(scope, receive, send)
+            return
+
+        # The route takes the typed object from request.state. Anything that still
+        # reads the body gets the sanitized JSON, encoded only if it is read.
+        state["validated_item"] = item
+        await self.app(scope, _replay(lambda: json.dumps({"name": item.name}).encode(), receive), send)
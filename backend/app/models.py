@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import JSON, Column, DateTime, Integer, String, func
 from .db import Base
 
 
@@ -6,3 +6,16 @@ class Item(Base):
     __tablename__ = "items"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
+
+
+class AuditOutbox(Base):
+    """Audit records staged in the same transaction as the item they describe.
+
+    Each `record` holds the `item_audit` insert values; the outbox relay moves
+    them to `item_audit` in bulk and deletes them.
+    """
+
+    __tablename__ = "audit_outbox"
+    id = Column(Integer, primary_key=True)
+    record = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
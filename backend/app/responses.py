@@ -0,0 +1,70 @@
+"""Fast JSON response classes for the item (and audit) routes.
+
+`FastJSONResponse` renders with orjson when it is installed and with
+pydantic-core's `to_json` otherwise; both skip `jsonable_encoder` and the
+stdlib encoder. `ItemListResponse` serializes a list of items (ORM objects,
+rows or dicts) through one compiled `TypeAdapter(List[ItemRead])`.
+"""
+
+import json
+from typing import Any, Iterable, List
+
+from fastapi.responses import JSONResponse
+
+from app import schemas
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    from pydantic import TypeAdapter
+    from pydantic_core import to_json
+except ImportError:  # pydantic v1
+    TypeAdapter = None  # type: ignore
+    to_json = None  # type: ignore
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain JSON-compatible `content` (dicts, lists, scalars) to bytes."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    if to_json is not None:
+        return to_json(content)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+_item_adapter = TypeAdapter(schemas.ItemRead) if TypeAdapter is not None else None
+_item_list_adapter = TypeAdapter(List[schemas.ItemRead]) if TypeAdapter is not None else None
+
+
+def dump_item(item: Any) -> bytes:
+    """Serialize one ItemRead-compatible object (ORM instance or dict) to JSON bytes."""
+    if _item_adapter is not None:
+        return _item_adapter.dump_json(_item_adapter.validate_python(item, from_attributes=True))
+    return dumps(schemas.ItemRead.from_orm(item).dict())
+
+
+def dump_items(items: Iterable[Any]) -> bytes:
+    """Serialize ItemRead-compatible objects as a JSON array in one adapter call."""
+    if _item_list_adapter is not None:
+        return _item_list_adapter.dump_json(
+            _item_list_adapter.validate_python(list(items), from_attributes=True)
+        )
+    return dumps([schemas.ItemRead.from_orm(item).dict() for item in items])
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ItemResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dump_item(content)
+
+
+class ItemListResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dump_items(content)
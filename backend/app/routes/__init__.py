@@ -1 +1,3 @@
 from . import items
+from . import audit
+from . import health
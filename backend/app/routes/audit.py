@@ -0,0 +1,170 @@
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Table, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import get_async_db
+from app.responses import FastJSONResponse, dumps
+from app.services import audit as audit_service
+from app.utils import cursor_id, decode_cursor, encode_cursor
+
+router = APIRouter(default_response_class=FastJSONResponse)
+
+# Columns returned for each audit row, in response order
+_AUDIT_FIELDS = (
+    "id",
+    "item_id",
+    "action",
+    "created_at",
+    "user_id",
+    "ip",
+    "method",
+    "user_agent",
+    "request_path",
+    "payload",
+)
+
+
+def _audit_table(sync_conn, engine) -> Table:
+    # reflected (or created) once per engine and cached by the audit service
+    return audit_service.get_audit_writer(engine, bind=sync_conn).table
+
+
+def _decode_audit_after(after: Optional[str]):
+    """Return the (created_at, id) keyset position encoded in `after`, or None."""
+    if not after:
+        return None
+    try:
+        values = decode_cursor(after)
+        return datetime.fromisoformat(values["created_at"]), cursor_id(values)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def _audit_select(
+    audit_table: Table,
+    *,
+    filters: dict,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    after,
+    descending: bool,
+):
+    """Core select for one filtered, (created_at, id)-ordered slice of `item_audit`.
+
+    Equality filters on the indexed typed columns plus a `created_at` range,
+    and a row-value keyset predicate, so each page is a bounded range scan of
+    the composite indexes from migration 0009 (and only touches the matching
+    partitions on Postgres).
+    """
+    c = audit_table.c
+    stmt = select(*(c[name] for name in _AUDIT_FIELDS if name in c))
+    for name, value in filters.items():
+        if value is not None:
+            stmt = stmt.where(c[name] == value)
+    if since is not None:
+        stmt = stmt.where(c.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(c.created_at < until)
+
+    position = tuple_(c.created_at, c.id)
+    if after is not None:
+        stmt = stmt.where(position < tuple_(*after) if descending else position > tuple_(*after))
+    if descending:
+        return stmt.order_by(c.created_at.desc(), c.id.desc())
+    return stmt.order_by(c.created_at, c.id)
+
+
+def _audit_row(row) -> dict:
+    # plain str keys: reflected column names are `quoted_name`, which orjson rejects
+    data = {str(key): value for key, value in row._mapping.items()}
+    created_at = data.get("created_at")
+    if created_at is not None:
+        data["created_at"] = created_at.isoformat()
+    return data
+
+
+async def _iter_audit_ndjson(select_kwargs: dict) -> AsyncIterator[bytes]:
+    """Yield matching audit rows as NDJSON through a server-side cursor.
+
+    Uses its own connection because the body is produced after the route returns.
+    """
+    # import app.db here so we get the current engine value (tests may swap it)
+    import app.db as app_db
+
+    batch_size = settings.ITEMS_STREAM_BATCH_SIZE
+    engine = app_db.async_engine
+    async with engine.connect() as conn:
+        audit_table = await conn.run_sync(_audit_table, engine)
+        stmt = _audit_select(audit_table, **select_kwargs)
+        result = await conn.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.partitions(batch_size):
+            yield b"".join(dumps(_audit_row(row)) + b"\n" for row in rows)
+
+
+@router.get("/audit")
+async def read_audit(
+    request: Request,
+    user_id: Optional[str] = Query(None, max_length=128),
+    ip: Optional[str] = Query(None, max_length=45),
+    method: Optional[str] = Query(None, max_length=16),
+    item_id: Optional[int] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.AUDIT_MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    stream: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Return audit rows matching the filters, newest first by default.
+
+    Filters are exact matches on `user_id`, `ip`, `method` and `item_id`, plus
+    a half-open `since <= created_at < until` range. Pagination is keyset-based
+    on `(created_at, id)`: `after` is the opaque cursor from the previous page's
+    `X-Next-Cursor` header, so deep pages cost the same as the first one.
+
+    With `stream=true` every matching row (optionally resuming from `after`) is
+    returned as `application/x-ndjson`; `limit` is ignored in that mode.
+    """
+    select_kwargs = {
+        "filters": {"user_id": user_id, "ip": ip, "method": method, "item_id": item_id},
+        "since": since,
+        "until": until,
+        "after": _decode_audit_after(after),
+        "descending": order == "desc",
+    }
+
+    if stream:
+        return StreamingResponse(
+            _iter_audit_ndjson(select_kwargs), media_type="application/x-ndjson"
+        )
+
+    page_size = limit or settings.AUDIT_PAGE_SIZE
+    audit_table = await db.run_sync(lambda s: _audit_table(s.connection(), db.bind))
+    # fetch one extra row to learn whether another page exists without a count(*)
+    stmt = _audit_select(audit_table, **select_kwargs).limit(page_size + 1)
+    rows = (await db.execute(stmt)).all()
+
+    headers = {}
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor(
+            {"created_at": last["created_at"].isoformat(), "id": last["id"]}
+        )
+        headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.include_query_params(limit=page_size, after=next_cursor)
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return Response(
+        content=dumps([_audit_row(row) for row in rows]),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Request, Response, status
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def health():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(request: Request, response: Response):
+    """Readiness: 200 once the startup warm-up has finished, 503 before that and during shutdown."""
+    if getattr(request.app.state, "ready", False):
+        return {"status": "ready"}
+    response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "starting"}
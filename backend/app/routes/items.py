@@ -1,87 +1,394 @@
-from fastapi import APIRouter, Depends, Request, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db import get_db, engine, SessionLocal
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.db import get_async_db
 from app import models, schemas
-from app.utils import sanitize, extract_request_metadata
+from app.middleware.validation import get_validated_item, validate_item_payloads
+from app.responses import FastJSONResponse, ItemListResponse, ItemResponse, dumps
+from app.utils import extract_request_metadata, encode_cursor, decode_cursor, cursor_id
 from app.services import audit as audit_service
+from app.services import audit_outbox
+from app.services import audit_policy
+from app.services import item_stats
+
+router = APIRouter(default_response_class=FastJSONResponse)
+
+
+def _decode_after(after: Optional[str]) -> Optional[int]:
+    """Return the last-seen item id encoded in `after`, or None for the first page."""
+    if not after:
+        return None
+    try:
+        return cursor_id(decode_cursor(after))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+async def _page_version(db: AsyncSession, after_id: Optional[int], window: int) -> str:
+    """Return a version string for the page window starting after `after_id`.
+
+    It is `count:max(id)` over the first `window` ids past `after_id`, a bounded
+    range scan of the primary key. Items are append-only (never updated or
+    deleted), so a window's content only changes when a newly committed id
+    falls inside it, and that always changes the count (window not full) or
+    lowers the max (a new id below the old max pushes the last one out).
+    This holds even when ids commit out of order, which `max(id)` over the
+    whole table would miss: a transaction that took id 10 but commits after
+    id 11 leaves the table max at 11.
+    """
+    ids = select(models.Item.id)
+    if after_id is not None:
+        ids = ids.where(models.Item.id > after_id)
+    window_ids = ids.order_by(models.Item.id).limit(window).subquery()
+    count, max_id = (
+        await db.execute(select(func.count(), func.max(window_ids.c.id)))
+    ).one()
+    return f"{count}:{max_id or 0}"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return True when an `If-None-Match` header value matches `etag`."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+# Columns clients may project with `?fields=`; keys are the JSON field names
+_ITEM_FIELDS = {"id": models.Item.id, "name": models.Item.name}
+
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    """Return the requested field names, in model order, or 400 on unknown names."""
+    if not fields:
+        return list(_ITEM_FIELDS)
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(_ITEM_FIELDS)
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}" if unknown else "No fields requested",
+        )
+    return [name for name in _ITEM_FIELDS if name in requested]
+
+
+def _projected_select(names: List[str], after_id: Optional[int]):
+    """Core select of `names` plus a trailing id column used for the keyset.
+
+    Rows come back as plain tuples, so no ORM instances (identity map,
+    instance state) are built for listing.
+    """
+    stmt = select(*(_ITEM_FIELDS[name] for name in names), models.Item.id)
+    if after_id is not None:
+        stmt = stmt.where(models.Item.id > after_id)
+    return stmt.order_by(models.Item.id)
+
+
+def _rows_to_dicts(names: List[str], rows) -> list:
+    return [dict(zip(names, row)) for row in rows]
+
+
+async def _iter_items_ndjson(after_id: Optional[int], names: List[str]) -> AsyncIterator[bytes]:
+    """Yield items as NDJSON chunks read through a server-side cursor.
 
-router = APIRouter()
+    Uses its own connection (not the request session) because the body is
+    produced after the route returns. `stream_results` keeps the driver from
+    buffering the whole result set, so memory stays at one batch of rows.
+    """
+    # import app.db here so we get the current engine value (tests may swap it)
+    import app.db as app_db
+
+    stmt = _projected_select(names, after_id)
+    batch_size = settings.ITEMS_STREAM_BATCH_SIZE
+    async with app_db.async_engine.connect() as conn:
+        result = await conn.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.partitions(batch_size):
+            yield b"".join(dumps(row) + b"\n" for row in _rows_to_dicts(names, rows))
 
 
 @router.get("/items")
-def read_items(db: Session = Depends(get_db)):
-    return db.query(models.Item).all()
+async def read_items(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=settings.ITEMS_MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    stream: bool = Query(False),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Return one page of items ordered by id.
 
+    Pagination is keyset-based: `after` is the opaque cursor returned in the
+    `X-Next-Cursor` header of the previous page, so every page is a bounded
+    index range scan on the primary key regardless of how deep the caller is.
 
-@router.post("/items", response_model=schemas.ItemRead, status_code=201)
-async def create_item(request: Request, db: Session = Depends(get_db)):
-    validated = getattr(request.state, "validated_json", None)
-    if validated is None:
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body"
+    `fields` is a comma-separated subset of `id,name`; only those columns are
+    selected (Core `select()`, no ORM instances) and the rows are encoded
+    straight to JSON without going through `jsonable_encoder`.
+
+    Pages carry a strong `ETag` built from the version of the rows in the page
+    window and the page position; a request whose `If-None-Match` matches gets a 304 without the
+    rows being read or serialized.
+
+    With `stream=true` the whole table (optionally resuming from `after`) is
+    returned as `application/x-ndjson` instead, one item per line; `limit` is
+    ignored in that mode.
+    """
+    page_size = limit or settings.ITEMS_PAGE_SIZE
+    after_id = _decode_after(after)
+    names = _parse_fields(fields)
+
+    if stream:
+        return StreamingResponse(
+            _iter_items_ndjson(after_id, names), media_type="application/x-ndjson"
+        )
+
+    # the window includes the look-ahead row, so X-Next-Cursor is covered too
+    version = await _page_version(db, after_id, page_size + 1)
+    etag = f'"items-{version}-{page_size}-{after_id or 0}-{"+".join(names)}"'
+    # let browsers keep the body but always revalidate it with If-None-Match
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # fetch one extra row to learn whether another page exists without a count(*)
+    stmt = _projected_select(names, after_id).limit(page_size + 1)
+    rows = (await db.execute(stmt)).all()
+
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor({"id": rows[-1][-1]})
+        headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.include_query_params(limit=page_size, after=next_cursor)
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return Response(
+        content=dumps(_rows_to_dicts(names, rows)),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@router.head("/items")
+async def head_items(exact: bool = Query(False), db: AsyncSession = Depends(get_async_db)):
+    """Return item count metadata in `X-Total-Count` without a body."""
+    count, is_exact = await item_stats.count_items(db, exact=exact)
+    return Response(
+        headers={
+            "X-Total-Count": str(count),
+            "X-Total-Count-Exact": "true" if is_exact else "false",
+        }
+    )
+
+
+@router.get("/items/count")
+async def count_items(exact: bool = Query(False), db: AsyncSession = Depends(get_async_db)):
+    """Return the number of items.
+
+    By default this is an estimate (`pg_class.reltuples` on Postgres) that
+    never scans the table; `exact=true` runs `count(*)`, cached for
+    `ITEMS_COUNT_CACHE_TTL` seconds.
+    """
+    count, is_exact = await item_stats.count_items(db, exact=exact)
+    return {"count": count, "exact": is_exact}
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input (used with escape character `\\`)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@router.get("/items/search", response_model=List[schemas.ItemRead])
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=100),
+    mode: str = Query("substring", pattern="^(prefix|substring)$"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.ITEMS_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=10000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Case-insensitive name search, ranked best match first.
+
+    `mode=prefix` only matches names starting with `q`; the default
+    `substring` matches anywhere. Exact matches rank first, then prefix
+    matches, then (on Postgres) trigram similarity, then shorter names.
+    On Postgres the ILIKE is served by the `ix_items_name_trgm` GIN index
+    (migration 0006); other dialects fall back to a plain LIKE scan.
+    """
+    page_size = limit or settings.ITEMS_PAGE_SIZE
+    needle = _escape_like(q)
+    pattern = f"{needle}%" if mode == "prefix" else f"%{needle}%"
+    name = models.Item.name
+    q_lower = q.lower()
+
+    order_by = [
+        case((func.lower(name) == q_lower, 0), else_=1),
+        case((name.ilike(f"{needle}%", escape="\\"), 0), else_=1),
+    ]
+    if db.bind.dialect.name == "postgresql":
+        order_by.append(func.similarity(name, q).desc())
+    order_by.extend([func.length(name), models.Item.id])
+
+    stmt = (
+        select(models.Item)
+        .where(name.ilike(pattern, escape="\\"))
+        .order_by(*order_by)
+        .limit(page_size)
+        .offset(offset)
+    )
+    return ItemListResponse((await db.execute(stmt)).scalars().all())
+
+
+def _outbox_enabled() -> bool:
+    return bool(getattr(settings, "AUDIT_OUTBOX_ENABLED", False))
+
+
+async def _dispatch_audit(request: Request, db_items, payloads, verbosity: str) -> None:
+    """Hand committed items' audit records to the batch writer, or insert them directly.
+
+    Not used in outbox mode, where records are staged before the commit.
+    """
+    # import app.db here so we get the current engine value (tests may swap it)
+    import app.db as app_db
+    import logging
+
+    writer = getattr(request.app.state, "audit_writer", None)
+    try:
+        if writer is not None and writer.running:
+            # queued and written in bulk by the background writer, off the request path
+            for db_item, payload in zip(db_items, payloads):
+                await writer.submit(db_item, payload, verbosity)
+        elif len(db_items) == 1:
+            # no writer (e.g. lifespan not run): insert directly in a short transaction
+            # on the async engine so it doesn't interfere with the request session
+            await audit_service.insert_audit_async(
+                app_db.async_engine, db_items[0], payloads[0], verbosity=verbosity
+            )
+        else:
+            await audit_service.insert_audit_many_async(
+                app_db.async_engine, db_items, payloads, verbosity=verbosity
             )
-        validated = payload
-
-    item_in = schemas.ItemCreate(**validated)
-    # If the middleware has already validated/sanitized the body, avoid re-sanitizing.
-    # This keeps behavior idempotent but avoids duplicate work when middleware is enabled.
-    if getattr(request.state, "validated_json", None) is not None:
-        clean_name = item_in.name
-    else:
-        clean_name = sanitize(item_in.name)
-    db_item = models.Item(name=clean_name)
+    except Exception:
+        # errors are logged in the service; don't fail request
+        logging.getLogger("uvicorn.error").exception(
+            "audit insert raised an exception for item_ids=%s", [getattr(i, "id", None) for i in db_items]
+        )
+
+
+@router.post("/items", response_model=schemas.ItemRead, status_code=201)
+async def create_item(
+    request: Request,
+    item_in: schemas.ItemCreate = Depends(get_validated_item),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # `item_in` is parsed, validated and sanitized once (by the middleware or the dependency)
+    db_item = models.Item(name=item_in.name)
     db.add(db_item)
-    db.flush()
+    await db.flush()
 
     # capture id and payload early
     item_id = getattr(db_item, "id", None)
     meta = extract_request_metadata(request)
     payload = {"name": db_item.name, **meta}
 
+    # None when the audit policy skips this request (off / sampled out)
+    verbosity = audit_policy.decide(request.url.path, request.method)
+    outbox = _outbox_enabled()
+    if outbox and verbosity is not None:
+        # staged in this transaction: item and audit record commit together
+        await audit_outbox.stage_audit_records(
+            db, [audit_service.build_insert_values(db_item, payload, verbosity=verbosity)]
+        )
+
+    # sessions don't expire on commit, so db_item keeps its id/name without a refresh
     try:
-        db.commit()
+        await db.commit()
     except Exception:
         import logging
 
         logging.getLogger("uvicorn.error").exception(
             "Error committing transaction for item %s", item_id
         )
+        # nothing was saved (a staged audit record is rolled back with the item):
+        # don't report the item as created or audit it
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not save item"
+        )
+    item_stats.note_items_created(db, 1)
 
-    # refresh the instance from DB; if that fails, re-query by id
-    try:
-        db.refresh(db_item)
-    except Exception:
-        import logging
+    if not outbox and verbosity is not None:
+        await _dispatch_audit(request, [db_item], [payload], verbosity)
 
-        logging.getLogger("uvicorn.error").warning(
-            "Could not refresh item instance id=%s; performing simple re-query", item_id
-        )
+    return ItemResponse(db_item, status_code=201)
+
+
+@router.post("/items/batch", response_model=List[schemas.ItemBatchResult])
+async def create_items_batch(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Create many items in one request and return a result per input element.
+
+    Valid elements are written with a single multi-row `INSERT ... RETURNING`
+    and one commit, and their audit rows with a single bulk insert. Invalid
+    elements are reported with `ok=false` and don't affect the rest.
+    """
+    results = getattr(request.state, "validated_batch", None)
+    if results is None:
+        # middleware not configured for this path: apply the same checks here
         try:
-            db_item = db.query(models.Item).filter_by(id=item_id).one_or_none()
+            payload = await request.json()
         except Exception:
-            logging.getLogger("uvicorn.error").exception(
-                "Failed to re-query item after refresh failure"
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body"
             )
+        if not isinstance(payload, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Body must be a JSON array of items",
+            )
+        max_size = settings.ITEMS_BATCH_MAX_SIZE
+        if len(payload) > max_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Batch must contain at most {max_size} items",
+            )
+        results = validate_item_payloads(payload)
 
-    # perform audit insertion in a separate short-lived session to avoid interfering with request session
-    try:
-        with SessionLocal() as audit_db:
-            # import app.db here so we get the current engine value (tests may swap it)
-            import app.db as app_db
-            import logging
-
-            logger = logging.getLogger("uvicorn.error")
-            try:
-                logger.info("Calling insert_audit for item_id=%s", getattr(db_item, "id", None))
-                audit_service.insert_audit(audit_db, app_db.engine, db_item, payload)
-                logger.info("insert_audit completed for item_id=%s", getattr(db_item, "id", None))
-            except Exception:
-                logger.exception("insert_audit raised an exception for item_id=%s", getattr(db_item, "id", None))
-    except Exception:
-        # errors are logged in the service; don't fail request
-        pass
+    valid_indexes = [i for i, (validated, error) in enumerate(results) if error is None]
+    created = []
+    payloads = []
+    outbox = _outbox_enabled()
+    verbosity = audit_policy.decide(request.url.path, request.method) if valid_indexes else None
+    if valid_indexes:
+        stmt = insert(models.Item).returning(
+            models.Item.id, models.Item.name, sort_by_parameter_order=True
+        )
+        created = (await db.execute(stmt, [results[i][0] for i in valid_indexes])).all()
+        meta = extract_request_metadata(request)
+        payloads = [{"name": row.name, **meta} for row in created]
+        if outbox and verbosity is not None:
+            await audit_outbox.stage_audit_records(
+                db,
+                [
+                    audit_service.build_insert_values(row, p, verbosity=verbosity)
+                    for row, p in zip(created, payloads)
+                ],
+            )
+        await db.commit()
+        item_stats.note_items_created(db, len(created))
 
-    return db_item
+    if created and not outbox and verbosity is not None:
+        await _dispatch_audit(request, created, payloads, verbosity)
+
+    out = [
+        schemas.ItemBatchResult(index=i, ok=False, error=error)
+        for i, (validated, error) in enumerate(results)
+    ]
+    for i, row in zip(valid_indexes, created):
+        out[i] = schemas.ItemBatchResult(
+            index=i, ok=True, item=schemas.ItemRead(id=row.id, name=row.name)
+        )
+    return out
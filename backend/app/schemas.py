@@ -1,3 +1,5 @@
+from typing import Optional
+
 import pydantic
 from pydantic import BaseModel, constr
 
@@ -30,3 +32,12 @@ else:
 
         class Config:
             orm_mode = True
+
+
+class ItemBatchResult(BaseModel):
+    """Outcome for one element of a `POST /items/batch` request."""
+
+    index: int
+    ok: bool
+    item: Optional[ItemRead] = None
+    error: Optional[str] = None
@@ -1 +1,5 @@
 from . import audit
+from . import audit_policy
+from . import audit_queue
+from . import audit_outbox
+from . import item_stats
@@ -1,20 +1,34 @@
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlalchemy import Table, MetaData, text, inspect, Column, Integer, String, select
+from sqlalchemy import Table, MetaData, inspect, Column, DateTime, Integer, String, func, text
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy import JSON as SA_JSON
+from sqlalchemy.dialects.postgresql import JSONB
 import logging
 
+from app.config import settings
+from app.services import audit_policy
+
 
 _audit_table_cache = {}
 
 
-def _get_or_create_audit_table(engine):
+def _created_at_default(bind):
+    # SQLite's CURRENT_TIMESTAMP has no fractional part, while SQLAlchemy binds datetimes
+    # as "YYYY-MM-DD HH:MM:SS.ffffff"; store the same text format so created_at
+    # comparisons (GET /audit keyset pagination) order correctly
+    if getattr(getattr(bind, "dialect", None), "name", None) == "sqlite":
+        return text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))")
+    return func.now()
+
+
+def _get_or_create_audit_table(engine, bind=None):
     """Return a Table object for `item_audit`, creating it when missing.
 
-    Caches per-engine to avoid repeated reflection/creation.
+    Caches per-engine to avoid repeated reflection/creation. `bind` lets async
+    callers pass the sync Connection handed to `run_sync` for the reflection
+    itself while still caching against the owning engine.
     """
     # Use engine identity to avoid collisions between distinct Engine
     # objects that may share the same URL (e.g. multiple in-memory sqlite engines).
@@ -22,9 +36,12 @@ def _get_or_create_audit_table(engine):
     if key in _audit_table_cache:
         return _audit_table_cache[key]
 
+    if bind is None:
+        bind = engine
+
     meta = MetaData()
     try:
-        inspector = inspect(engine)
+        inspector = inspect(bind)
     except Exception:
         inspector = None
 
@@ -36,34 +53,173 @@ def _get_or_create_audit_table(engine):
             Column("id", Integer, primary_key=True),
             Column("item_id", Integer),
             Column("action", String),
-            Column("payload", SA_JSON),
+            Column("payload", SA_JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")),
             Column("user_id", String),
             Column("ip", String),
             Column("method", String),
             Column("user_agent", String),
             Column("request_path", String),
+            Column("created_at", DateTime(timezone=True), server_default=_created_at_default(bind)),
         )
-        meta.create_all(bind=engine)
+        meta.create_all(bind=bind)
     else:
-        audit_table = Table("item_audit", meta, autoload_with=engine)
+        audit_table = Table("item_audit", meta, autoload_with=bind)
 
     _audit_table_cache[key] = audit_table
     return audit_table
 
 
+# Request metadata stored in typed, indexed columns (migration 0002)
+_TYPED_PAYLOAD_KEYS = ("user_id", "ip", "user_agent", "request_path", "method")
+
+
+def build_insert_values(
+    db_item,
+    payload_metadata: dict,
+    *,
+    compact: Optional[bool] = None,
+    verbosity: str = audit_policy.FULL,
+) -> dict:
+    """Return the `item_audit` column values for one audit record.
+
+    With `compact` (default: `settings.AUDIT_PAYLOAD_COMPACT`) the typed
+    request fields are stored only in their columns and left out of `payload`.
+    `verbosity="metadata"` (see `audit_policy`) drops `payload` and `user_agent`.
+    """
+    if verbosity == audit_policy.METADATA:
+        payload = None
+    else:
+        if compact is None:
+            compact = getattr(settings, "AUDIT_PAYLOAD_COMPACT", False)
+        payload = payload_metadata
+        if compact:
+            payload = {k: v for k, v in payload_metadata.items() if k not in _TYPED_PAYLOAD_KEYS}
+    insert_values = {
+        "item_id": getattr(db_item, "id", None),
+        "action": "create",
+        "payload": payload,
+    }
+    for key in _TYPED_PAYLOAD_KEYS:
+        if key == "user_agent" and verbosity == audit_policy.METADATA:
+            continue
+        val = payload_metadata.get(key)
+        if val is not None:
+            insert_values[key] = val
+    return insert_values
+
+
+def _policy_verbosity(payload_metadata: dict) -> Optional[str]:
+    return audit_policy.decide(payload_metadata.get("request_path"), payload_metadata.get("method"))
+
+
 @dataclass
 class AuditInsertResult:
     success: bool
     id: Optional[int] = None
     row: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    # True when the audit policy decided not to record this event (nothing was written)
+    skipped: bool = False
 
 
 class AuditError(Exception):
     """Raised when an audit insertion should fail loudly."""
 
 
-def insert_audit(db, engine, db_item, payload_metadata: dict, *, fail_silent: bool = True, return_row: bool = False) -> AuditInsertResult:
+_AUDIT_VALUE_KEYS = ("item_id", "action", "payload", "user_id", "ip", "user_agent", "request_path", "method")
+
+
+class AuditWriter:
+    """Long-lived audit inserter bound to one engine.
+
+    Holds the `item_audit` Table and INSERT statements built once with a fixed
+    column set, so SQLAlchemy's compiled cache is hit on every call, and picks
+    the dialect's id-retrieval strategy up front:
+
+    - ``returning``: `INSERT ... RETURNING` (Postgres, SQLite >= 3.35);
+    - ``lastrowid``: the DBAPI cursor's `lastrowid` (MySQL, older SQLite);
+    - ``inserted_primary_key``: whatever the dialect provides otherwise.
+
+    Every insert is a single round trip; `return_row` without RETURNING is
+    assembled from the inserted values instead of re-selecting the row.
+    Use `get_audit_writer(engine)` rather than constructing one per call.
+    """
+
+    def __init__(self, audit_table: Table, dialect):
+        self.table = audit_table
+        self.keys = tuple(key for key in _AUDIT_VALUE_KEYS if key in audit_table.c)
+        # rows that carry their own event time (e.g. relayed from the outbox) keep it;
+        # everything else gets the column default
+        self.timed_keys = self.keys + (("created_at",) if "created_at" in audit_table.c else ())
+        if "payload" in audit_table.c and isinstance(audit_table.c.payload.type, SA_JSON):
+            # a missing payload (metadata-only verbosity) is SQL NULL, not JSON 'null'
+            audit_table.c.payload.type.none_as_null = True
+        self._insert = audit_table.insert()
+        if getattr(dialect, "insert_returning", False):
+            self.strategy = "returning"
+            self._insert_returning_id = self._insert.returning(audit_table.c.id)
+            self._insert_returning_row = self._insert.returning(*audit_table.c)
+        elif getattr(dialect, "postfetch_lastrowid", False):
+            self.strategy = "lastrowid"
+        else:
+            self.strategy = "inserted_primary_key"
+
+    def params(self, insert_values: dict) -> dict:
+        # one of two fixed key sets: cached compiled statements, and valid for executemany
+        keys = self.timed_keys if insert_values.get("created_at") is not None else self.keys
+        return {key: insert_values.get(key) for key in keys}
+
+    def insert(self, conn, insert_values: dict, return_row: bool = False):
+        """Insert one row on `conn` and return (id, row_or_None). The caller commits."""
+        params = self.params(insert_values)
+        if self.strategy == "returning":
+            if return_row:
+                row = conn.execute(self._insert_returning_row, params).mappings().fetchone()
+                inserted_row = dict(row) if row else None
+                return (inserted_row.get("id") if inserted_row else None), inserted_row
+            return conn.execute(self._insert_returning_id, params).scalar_one_or_none(), None
+
+        result = conn.execute(self._insert, params)
+        if self.strategy == "lastrowid":
+            new_audit_id = result.lastrowid
+        else:
+            pk = result.inserted_primary_key
+            new_audit_id = pk[0] if pk else None
+        inserted_row = None
+        if return_row and new_audit_id is not None:
+            inserted_row = {column.name: params.get(column.name) for column in self.table.c}
+            inserted_row["id"] = new_audit_id
+        return new_audit_id, inserted_row
+
+    def insert_many(self, conn, values_list: List[dict]) -> int:
+        """Insert all `values_list` rows with one executemany per key set and return the row count."""
+        rows = [self.params(values) for values in values_list]
+        timed = [row for row in rows if "created_at" in row]
+        untimed = [row for row in rows if "created_at" not in row]
+        for batch in (timed, untimed):
+            if batch:
+                conn.execute(self._insert, batch)
+        return len(rows)
+
+
+_audit_writer_cache = {}
+
+
+def get_audit_writer(engine, bind=None) -> AuditWriter:
+    """Return the cached `AuditWriter` for `engine`, creating it on first use.
+
+    `bind` is passed through to `_get_or_create_audit_table` (see there).
+    """
+    key = id(engine)
+    writer = _audit_writer_cache.get(key)
+    if writer is None:
+        audit_table = _get_or_create_audit_table(engine, bind=bind)
+        writer = AuditWriter(audit_table, (bind if bind is not None else engine).dialect)
+        _audit_writer_cache[key] = writer
+    return writer
+
+
+def insert_audit(db, engine, db_item, payload_metadata: dict, *, fail_silent: bool = True, return_row: bool = False, verbosity: Optional[str] = None) -> AuditInsertResult:
     """Insert an audit row and return an AuditInsertResult.
 
     Parameters:
@@ -73,135 +229,125 @@ def insert_audit(db, engine, db_item, payload_metadata: dict, *, fail_silent: bo
     - payload_metadata: dict payload to store in `payload` column
     - fail_silent: when False, raise `AuditError` on failure; when True return result with success=False
     - return_row: when True, return the inserted row as `row` (dict) when available
+    - verbosity: `full`/`metadata` as already decided by the caller; when None the
+      audit policy is evaluated here (a skipped event returns `skipped=True`)
 
-    Maintains previous behavior: prefers Postgres `RETURNING` for id retrieval and
-    falls back to a deterministic select for other dialects.
+    Thin wrapper around the engine's `AuditWriter`: one transaction, one
+    round trip. Rows written before the typed columns existed are handled by
+    `app.services.audit_backfill`, not here.
     """
     logger = logging.getLogger(__name__)
 
-    try:
-        logger.info("insert_audit called for item_id=%s", getattr(db_item, "id", None))
-    except Exception:
-        pass
+    if verbosity is None:
+        verbosity = _policy_verbosity(payload_metadata)
+        if verbosity is None:
+            return AuditInsertResult(success=True, skipped=True)
 
     try:
-        audit_table = _get_or_create_audit_table(engine)
+        writer = get_audit_writer(engine)
     except Exception as exc:
         msg = "Failed to ensure item_audit table: %s" % (exc,)
-        logging.getLogger(__name__).exception(msg)
-        result = AuditInsertResult(success=False, error=msg)
+        logger.exception(msg)
         if not fail_silent:
             raise AuditError(msg)
-        return result
-
-    insert_values = {
-        "item_id": getattr(db_item, "id", None),
-        "action": "create",
-        "payload": payload_metadata,
-    }
-    for key in ("user_id", "ip", "user_agent", "request_path", "method"):
-        val = payload_metadata.get(key)
-        if val is not None:
-            insert_values[key] = val
+        return AuditInsertResult(success=False, error=msg)
 
-    Session = sessionmaker(bind=engine)
-    new_audit_id = None
-    inserted_row = None
+    insert_values = build_insert_values(db_item, payload_metadata, verbosity=verbosity)
     try:
-        with Session() as s:
-            try:
-                bind = s.get_bind()
-                logger.debug("Audit session bind=%s", getattr(bind, "url", str(bind)))
-            except Exception:
-                pass
-
-            ins = audit_table.insert().values(**insert_values)
-
-            # Prefer RETURNING on Postgres to get the inserted id (and optionally the row)
-            if engine.dialect.name == "postgresql":
-                try:
-                    if return_row:
-                        ins = ins.returning(*audit_table.c)
-                        result = s.execute(ins)
-                        row = result.mappings().fetchone()
-                        if row:
-                            inserted_row = dict(row)
-                            new_audit_id = inserted_row.get("id")
-                    else:
-                        ins = ins.returning(audit_table.c.id)
-                        result = s.execute(ins)
-                        new_audit_id = result.scalar_one_or_none()
-                    s.commit()
-                except Exception as exc:
-                    s.rollback()
-                    logger.exception("Postgres audit INSERT failed")
-                    err = f"Postgres INSERT failed: {exc}"
-                    if not fail_silent:
-                        raise AuditError(err)
-                    return AuditInsertResult(success=False, id=None, row=None, error=err)
-            else:
-                try:
-                    s.execute(ins)
-                    s.commit()
-                except Exception as exc:
-                    s.rollback()
-                    logger.exception("Audit INSERT failed")
-                    err = f"Audit INSERT failed: {exc}"
-                    if not fail_silent:
-                        raise AuditError(err)
-                    return AuditInsertResult(success=False, id=None, row=None, error=err)
-
-                # best-effort: fetch last id deterministically
-                try:
-                    with engine.connect() as conn:
-                        sel = select(audit_table.c.id).order_by(audit_table.c.id.desc()).limit(1)
-                        new_audit_id = conn.execute(sel).scalar_one_or_none()
-                except Exception:
-                    logger.exception("Failed to fetch new audit id after insert")
-                    new_audit_id = None
-
-            # Postgres-only backfill: keep behavior for typed columns
-            if engine.dialect.name == "postgresql":
-                try:
-                    backfill_sql = text(
-                        "UPDATE item_audit SET "
-                        "user_id = COALESCE(user_id, payload ->> 'user_id'), "
-                        "ip = COALESCE(ip, payload ->> 'ip'), "
-                        "method = COALESCE(method, payload ->> 'method'), "
-                        "user_agent = COALESCE(user_agent, payload ->> 'user_agent'), "
-                        "request_path = COALESCE(request_path, payload ->> 'request_path') "
-                        "WHERE payload IS NOT NULL AND (user_id IS NULL OR ip IS NULL OR method IS NULL OR user_agent IS NULL OR request_path IS NULL)"
-                    )
-                    s.execute(backfill_sql)
-                    s.commit()
-                except Exception:
-                    logger.exception("Postgres backfill failed")
-
-    except SQLAlchemyError:
-        logger.exception("SQLAlchemyError during audit insertion")
+        with engine.begin() as conn:
+            new_audit_id, inserted_row = writer.insert(conn, insert_values, return_row)
+    except SQLAlchemyError as exc:
+        logger.exception("Audit INSERT failed")
+        err = f"Audit INSERT failed: {exc}"
         if not fail_silent:
-            raise AuditError("SQLAlchemyError during audit insertion")
-        return AuditInsertResult(success=False, id=None, row=None, error="SQLAlchemyError during audit insertion")
+            raise AuditError(err)
+        return AuditInsertResult(success=False, id=None, row=None, error=err)
     except Exception:
         logger.exception("Unexpected exception during audit insertion")
         if not fail_silent:
             raise AuditError("Unexpected exception during audit insertion")
         return AuditInsertResult(success=False, id=None, row=None, error="Unexpected exception during audit insertion")
 
-    # Optionally fetch the full row for non-postgres case when requested
-    if return_row and inserted_row is None and new_audit_id is not None:
-        try:
-            with engine.connect() as conn:
-                sel = select(audit_table).where(audit_table.c.id == new_audit_id)
-                row = conn.execute(sel).mappings().fetchone()
-                if row:
-                    inserted_row = dict(row)
-        except Exception:
-            logger.exception("Failed to fetch inserted audit row")
+    return AuditInsertResult(success=True, id=new_audit_id, row=inserted_row, error=None)
+
+
+def _insert_audit_on_connection(conn, engine, insert_values: dict, return_row: bool):
+    """Insert one audit row on a sync `conn` and return (id, row_or_None).
+
+    Runs inside `AsyncConnection.run_sync`, so it must only use `conn`.
+    """
+    return get_audit_writer(engine, bind=conn).insert(conn, insert_values, return_row)
+
+
+async def insert_audit_async(engine, db_item, payload_metadata: dict, *, fail_silent: bool = True, return_row: bool = False, verbosity: Optional[str] = None) -> AuditInsertResult:
+    """Async counterpart of `insert_audit` for use from the request path.
+
+    Parameters:
+    - engine: SQLAlchemy `AsyncEngine` to use for the insert
+    - db_item, payload_metadata, fail_silent, return_row, verbosity: as for `insert_audit`
+
+    The insert runs in a single transaction on one pooled connection; the
+    event loop is free while the database round trip is in flight.
+    """
+    logger = logging.getLogger(__name__)
+    if verbosity is None:
+        verbosity = _policy_verbosity(payload_metadata)
+        if verbosity is None:
+            return AuditInsertResult(success=True, skipped=True)
+    insert_values = build_insert_values(db_item, payload_metadata, verbosity=verbosity)
 
     try:
-        logger.info("insert_audit finished for item_id=%s", insert_values.get("item_id"))
-    except Exception:
-        pass
+        async with engine.begin() as conn:
+            new_audit_id, inserted_row = await conn.run_sync(
+                _insert_audit_on_connection, engine, insert_values, return_row
+            )
+    except Exception as exc:
+        logger.exception("Audit INSERT failed")
+        err = f"Audit INSERT failed: {exc}"
+        if not fail_silent:
+            raise AuditError(err)
+        return AuditInsertResult(success=False, id=None, row=None, error=err)
 
     return AuditInsertResult(success=True, id=new_audit_id, row=inserted_row, error=None)
+
+
+def _insert_audit_many_on_connection(conn, engine, values_list: List[dict]) -> int:
+    """Insert all `values_list` rows with one executemany and return the row count."""
+    return get_audit_writer(engine, bind=conn).insert_many(conn, values_list)
+
+
+async def insert_audit_values_many_async(engine, values_list: List[dict], *, fail_silent: bool = True) -> AuditInsertResult:
+    """Insert prebuilt audit `values_list` (see `build_insert_values`) in a single round trip."""
+    logger = logging.getLogger(__name__)
+    if not values_list:
+        return AuditInsertResult(success=True)
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(_insert_audit_many_on_connection, engine, values_list)
+    except Exception as exc:
+        logger.exception("Bulk audit INSERT failed")
+        err = f"Bulk audit INSERT failed: {exc}"
+        if not fail_silent:
+            raise AuditError(err)
+        return AuditInsertResult(success=False, error=err)
+
+    return AuditInsertResult(success=True)
+
+
+async def insert_audit_many_async(engine, db_items: Sequence, payload_metadata_list: Sequence[dict], *, fail_silent: bool = True, verbosity: Optional[str] = None) -> AuditInsertResult:
+    """Insert one audit row per `(db_item, payload_metadata)` pair in a single round trip.
+
+    Used by batch endpoints; per-row ids are not retrieved, so `id`/`row` on
+    the returned result are always None. When `verbosity` is None the audit
+    policy is evaluated once for the whole batch.
+    """
+    if verbosity is None and payload_metadata_list:
+        verbosity = _policy_verbosity(payload_metadata_list[0])
+        if verbosity is None:
+            return AuditInsertResult(success=True, skipped=True)
+    values_list = [
+        build_insert_values(db_item, payload, verbosity=verbosity or audit_policy.FULL)
+        for db_item, payload in zip(db_items, payload_metadata_list)
+    ]
+    return await insert_audit_values_many_async(engine, values_list, fail_silent=fail_silent)
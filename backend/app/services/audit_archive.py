@@ -0,0 +1,339 @@
+"""Archive a `created_at` range of `item_audit` to compressed files, then delete it.
+
+Rows in `[since, until)` are read in `(created_at, id)` order through a
+server-side cursor (`stream_results`, one batch in memory at a time) and
+written as gzip-compressed NDJSON and, when `pyarrow` is installed, as a
+Parquet file. A `manifest.json` next to the files records the range, row
+count, id bounds and each file's size and SHA-256.
+
+Deletion is a separate step that first re-verifies the files against the
+manifest and the row count still in the database, then deletes the range in
+id-ordered batches, each in its own short transaction, so no long-running
+transaction holds locks or bloats the table. An existing archive is never
+overwritten: re-running the CLI with `--delete` on the same `--out` skips
+the export and resumes deleting against the original manifest. When the range is whole
+partitions, detaching them with `app.services.audit_partitions` is cheaper.
+
+Usage (from backend/):
+  python -m app.services.audit_archive --since 2025-01-01 --until 2025-02-01 --out DIR
+      [--format ndjson|parquet|both] [--batch-size N] [--delete] [--sleep SECONDS]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy import and_, delete, func, select
+
+from app.responses import dumps
+from app.services import audit as audit_service
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+
+_log = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+class ArchiveError(Exception):
+    """Raised when an archive does not match its manifest or the database."""
+
+
+@dataclass
+class ArchiveFile:
+    path: str
+    format: str
+    rows: int
+    bytes: int
+    sha256: str
+
+
+@dataclass
+class ArchiveManifest:
+    table: str
+    since: str
+    until: str
+    rows: int = 0
+    min_id: Optional[int] = None
+    max_id: Optional[int] = None
+    created: str = ""
+    files: List[ArchiveFile] = field(default_factory=list)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "ArchiveManifest":
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        data["files"] = [ArchiveFile(**f) for f in data.get("files", [])]
+        return cls(**data)
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _range_clause(audit_table, since: datetime, until: datetime, max_id: Optional[int] = None):
+    c = audit_table.c
+    clause = and_(c.created_at >= since, c.created_at < until)
+    if max_id is not None:
+        # never touch rows that were inserted into the range after the export
+        clause = and_(clause, c.id <= max_id)
+    return clause
+
+
+def _plain_row(row) -> dict:
+    # plain str keys: reflected column names are `quoted_name`, which orjson rejects
+    return {str(key): value for key, value in row._mapping.items()}
+
+
+def _ndjson_line(row: dict) -> bytes:
+    created_at = row.get("created_at")
+    if created_at is not None:
+        row = {**row, "created_at": created_at.isoformat()}
+    return dumps(row) + b"\n"
+
+
+class _ParquetSink:
+    """Accumulates row batches into one Parquet file (payload kept as JSON text,
+    `created_at` as a native timestamp column)."""
+
+    def __init__(self, path: str, column_names: List[str]):
+        self.path = path
+        self.column_names = column_names
+        self._writer = None
+
+    def write(self, rows: List[dict]) -> None:
+        columns = {name: [row.get(name) for row in rows] for name in self.column_names}
+        if "payload" in columns:
+            columns["payload"] = [None if p is None else json.dumps(p) for p in columns["payload"]]
+        batch = pa.table(columns)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, batch.schema, compression="zstd")
+        self._writer.write_table(batch.cast(self._writer.schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def export_range(
+    engine,
+    since: datetime,
+    until: datetime,
+    out_dir: str,
+    *,
+    formats=("ndjson", "parquet"),
+    batch_size: int = 5000,
+) -> ArchiveManifest:
+    """Write `[since, until)` to `out_dir` and return the manifest (also saved there).
+
+    Parquet is skipped (with a warning) when pyarrow is not installed.
+    """
+    formats = list(formats)
+    if "parquet" in formats and pa is None:
+        _log.warning("pyarrow is not installed; skipping the Parquet export")
+        formats.remove("parquet")
+    if not formats:
+        raise ArchiveError("no output format available")
+    if os.path.exists(os.path.join(out_dir, MANIFEST_NAME)):
+        # re-exporting after a partial delete would replace the archive with fewer rows
+        raise ArchiveError(f"{out_dir} already holds an archive; use a new directory or resume the delete")
+
+    os.makedirs(out_dir, exist_ok=True)
+    audit_table = audit_service._get_or_create_audit_table(engine)
+    column_names = [str(col.name) for col in audit_table.c]
+    stem = f"item_audit_{since:%Y%m%dT%H%M%S}_{until:%Y%m%dT%H%M%S}"
+    manifest = ArchiveManifest(table="item_audit", since=since.isoformat(), until=until.isoformat())
+
+    ndjson_path = os.path.join(out_dir, stem + ".ndjson.gz")
+    parquet_path = os.path.join(out_dir, stem + ".parquet")
+    ndjson = gzip.open(ndjson_path, "wb") if "ndjson" in formats else None
+    parquet = _ParquetSink(parquet_path, column_names) if "parquet" in formats else None
+
+    stmt = (
+        select(audit_table)
+        .where(_range_clause(audit_table, since, until))
+        .order_by(audit_table.c.created_at, audit_table.c.id)
+    )
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+            for rows in result.partitions(batch_size):
+                plain = [_plain_row(row) for row in rows]
+                if ndjson is not None:
+                    ndjson.write(b"".join(_ndjson_line(row) for row in plain))
+                if parquet is not None:
+                    parquet.write(plain)
+                ids = [row["id"] for row in plain]
+                lo, hi = min(ids), max(ids)
+                manifest.rows += len(plain)
+                manifest.min_id = lo if manifest.min_id is None else min(manifest.min_id, lo)
+                manifest.max_id = hi if manifest.max_id is None else max(manifest.max_id, hi)
+    finally:
+        if ndjson is not None:
+            ndjson.close()
+        if parquet is not None:
+            parquet.close()
+
+    for fmt, path in (("ndjson", ndjson_path), ("parquet", parquet_path)):
+        if fmt in formats and os.path.exists(path):
+            manifest.files.append(
+                ArchiveFile(
+                    path=os.path.basename(path),
+                    format=fmt,
+                    rows=manifest.rows,
+                    bytes=os.path.getsize(path),
+                    sha256=_file_digest(path),
+                )
+            )
+    manifest.created = datetime.now(timezone.utc).isoformat()
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as fh:
+        fh.write(manifest.to_json())
+    return manifest
+
+
+def _count_file_rows(path: str, fmt: str) -> int:
+    if fmt == "ndjson":
+        with gzip.open(path, "rb") as fh:
+            return sum(1 for _ in fh)
+    if pq is None:
+        raise ArchiveError(f"pyarrow is required to verify {path}")
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def verify_archive(engine, out_dir: str, *, resuming: bool = False) -> ArchiveManifest:
+    """Check every file's checksum and row count, and that the database still holds
+    exactly the archived rows; raise `ArchiveError` otherwise.
+
+    With `resuming=True` (finishing an interrupted delete) fewer rows than
+    archived are accepted, but never more.
+    """
+    manifest = ArchiveManifest.load(os.path.join(out_dir, MANIFEST_NAME))
+    if not manifest.files:
+        raise ArchiveError("manifest lists no files")
+    for f in manifest.files:
+        path = os.path.join(out_dir, f.path)
+        if _file_digest(path) != f.sha256:
+            raise ArchiveError(f"checksum mismatch for {f.path}")
+        rows = _count_file_rows(path, f.format)
+        if rows != f.rows or rows != manifest.rows:
+            raise ArchiveError(f"{f.path} has {rows} rows, manifest says {manifest.rows}")
+
+    if manifest.rows:
+        audit_table = audit_service._get_or_create_audit_table(engine)
+        clause = _range_clause(
+            audit_table,
+            datetime.fromisoformat(manifest.since),
+            datetime.fromisoformat(manifest.until),
+            manifest.max_id,
+        )
+        with engine.connect() as conn:
+            in_db = conn.execute(select(func.count()).select_from(audit_table).where(clause)).scalar()
+        if in_db > manifest.rows or (in_db < manifest.rows and not resuming):
+            raise ArchiveError(f"database holds {in_db} rows for the range, archive has {manifest.rows}")
+    return manifest
+
+
+def delete_archived(
+    engine,
+    manifest: ArchiveManifest,
+    *,
+    batch_size: int = 5000,
+    sleep_seconds: float = 0.0,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Delete the archived rows in id-ordered batches; return the number deleted.
+
+    Pass the manifest returned by `verify_archive`. Each batch commits on its
+    own, so an interrupted run can simply be repeated.
+    """
+    if not manifest.rows:
+        return 0
+    audit_table = audit_service._get_or_create_audit_table(engine)
+    clause = _range_clause(
+        audit_table,
+        datetime.fromisoformat(manifest.since),
+        datetime.fromisoformat(manifest.until),
+        manifest.max_id,
+    )
+    ids = select(audit_table.c.id).where(clause).order_by(audit_table.c.id).limit(batch_size)
+    deleted = 0
+    while True:
+        with engine.begin() as conn:
+            batch = [row[0] for row in conn.execute(ids)]
+            if batch:
+                conn.execute(delete(audit_table).where(audit_table.c.id.in_(batch)))
+        if not batch:
+            return deleted
+        deleted += len(batch)
+        if on_progress is not None:
+            on_progress(deleted)
+        if sleep_seconds > 0:
+            time.sleep(sleep_seconds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="defaults to settings.DATABASE_URL")
+    parser.add_argument("--since", required=True, type=datetime.fromisoformat)
+    parser.add_argument("--until", required=True, type=datetime.fromisoformat)
+    parser.add_argument("--out", required=True, help="output directory (one per archived range)")
+    parser.add_argument("--format", choices=("ndjson", "parquet", "both"), default="both")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--delete", action="store_true", help="delete the range after verifying the files")
+    parser.add_argument("--sleep", type=float, default=0.0, help="seconds to pause between delete batches")
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine
+
+    from app.config import settings
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, pool_pre_ping=True)
+    resuming = os.path.exists(os.path.join(args.out, MANIFEST_NAME))
+    if resuming:
+        # never re-export over an archive: after a partial delete it would hold fewer rows
+        if not args.delete:
+            parser.error(f"{args.out} already holds an archive; pass --delete to resume deleting it")
+        manifest = ArchiveManifest.load(os.path.join(args.out, MANIFEST_NAME))
+        if (manifest.since, manifest.until) != (args.since.isoformat(), args.until.isoformat()):
+            parser.error(f"{args.out} holds the archive for [{manifest.since}, {manifest.until})")
+        print(f"{args.out} already holds an archive of {manifest.rows} rows; resuming the delete")
+    else:
+        formats = ("ndjson", "parquet") if args.format == "both" else (args.format,)
+        manifest = export_range(engine, args.since, args.until, args.out, formats=formats, batch_size=args.batch_size)
+        print(f"exported {manifest.rows} rows: {', '.join(f.path for f in manifest.files)}")
+
+    if args.delete:
+        manifest = verify_archive(engine, args.out, resuming=resuming)
+        print("verified archive against manifest and database")
+        deleted = delete_archived(
+            engine,
+            manifest,
+            batch_size=args.batch_size,
+            sleep_seconds=args.sleep,
+            on_progress=lambda n: print(f"deleted {n}/{manifest.rows}"),
+        )
+        print(f"deleted {deleted} rows")
+
+
+if __name__ == "__main__":
+    main()
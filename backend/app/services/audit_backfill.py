@@ -0,0 +1,150 @@
+"""Chunked, resumable backfill of `item_audit` typed columns from `payload`.
+
+Copies `user_id`, `ip`, `method`, `user_agent` and `request_path` out of the
+JSON payload for rows written before those columns existed (see migrations
+0002/0003). Rows are processed in id-ordered ranges of `chunk_size`; each
+chunk's UPDATE and the new watermark commit in one transaction, so a run can
+be interrupted at any point and resumed later without redoing work.
+
+Usage (from backend/):
+  python -m app.services.audit_backfill [--chunk-size N] [--sleep SECONDS] [--max-chunks N] [--reset]
+"""
+
+import argparse
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select, text
+
+
+_log = logging.getLogger(__name__)
+
+DEFAULT_JOB = "item_audit_typed_columns"
+
+_state_meta = MetaData()
+backfill_state = Table(
+    "audit_backfill_state",
+    _state_meta,
+    Column("name", String(64), primary_key=True),
+    Column("last_id", Integer, nullable=False, default=0),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
+)
+
+# Same statement the request path used to run table-wide, restricted to one id range
+_CHUNK_SQL = text(
+    "UPDATE item_audit SET "
+    "user_id = COALESCE(user_id, payload ->> 'user_id'), "
+    "ip = COALESCE(ip, payload ->> 'ip'), "
+    "method = COALESCE(method, payload ->> 'method'), "
+    "user_agent = COALESCE(user_agent, payload ->> 'user_agent'), "
+    "request_path = COALESCE(request_path, payload ->> 'request_path') "
+    "WHERE id > :lo AND id <= :hi AND payload IS NOT NULL "
+    "AND (user_id IS NULL OR ip IS NULL OR method IS NULL OR user_agent IS NULL OR request_path IS NULL)"
+)
+
+
+@dataclass
+class BackfillProgress:
+    last_id: int
+    max_id: int
+    chunks: int = 0
+    rows_updated: int = 0
+    done: bool = False
+
+
+def _load_watermark(conn, job: str) -> int:
+    row = conn.execute(select(backfill_state.c.last_id).where(backfill_state.c.name == job)).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _save_watermark(conn, job: str, last_id: int) -> None:
+    updated = conn.execute(
+        backfill_state.update().where(backfill_state.c.name == job).values(last_id=last_id)
+    ).rowcount
+    if not updated:
+        conn.execute(backfill_state.insert().values(name=job, last_id=last_id))
+
+
+def reset_watermark(engine, job: str = DEFAULT_JOB) -> None:
+    _state_meta.create_all(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(backfill_state.delete().where(backfill_state.c.name == job))
+
+
+def run_backfill(
+    engine,
+    *,
+    job: str = DEFAULT_JOB,
+    chunk_size: int = 5000,
+    sleep_seconds: float = 0.0,
+    max_chunks: Optional[int] = None,
+    on_progress: Optional[Callable[[BackfillProgress], None]] = None,
+) -> BackfillProgress:
+    """Backfill from the persisted watermark up to the current max(id).
+
+    - `sleep_seconds` pauses between chunks to throttle load on the primary;
+    - `max_chunks` bounds one invocation (the next run resumes where it stopped);
+    - `on_progress` is called after every committed chunk.
+    """
+    _state_meta.create_all(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        last_id = _load_watermark(conn, job)
+        max_id = conn.execute(text("SELECT max(id) FROM item_audit")).scalar() or 0
+
+    progress = BackfillProgress(last_id=last_id, max_id=max_id)
+    while progress.last_id < max_id:
+        if max_chunks is not None and progress.chunks >= max_chunks:
+            return progress
+        hi = min(progress.last_id + chunk_size, max_id)
+        with engine.begin() as conn:
+            result = conn.execute(_CHUNK_SQL, {"lo": progress.last_id, "hi": hi})
+            _save_watermark(conn, job, hi)
+        progress.last_id = hi
+        progress.chunks += 1
+        progress.rows_updated += max(result.rowcount or 0, 0)
+        if on_progress is not None:
+            on_progress(progress)
+        if sleep_seconds > 0 and progress.last_id < max_id:
+            time.sleep(sleep_seconds)
+
+    progress.done = True
+    return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="defaults to settings.DATABASE_URL")
+    parser.add_argument("--job", default=DEFAULT_JOB)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--sleep", type=float, default=0.0, help="seconds to pause between chunks")
+    parser.add_argument("--max-chunks", type=int, default=None)
+    parser.add_argument("--reset", action="store_true", help="restart from id 0")
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine
+
+    from app.config import settings
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, pool_pre_ping=True)
+    if args.reset:
+        reset_watermark(engine, args.job)
+
+    def report(p: BackfillProgress) -> None:
+        pct = 100.0 * p.last_id / p.max_id if p.max_id else 100.0
+        print(f"[{args.job}] id {p.last_id}/{p.max_id} ({pct:.1f}%), chunks={p.chunks}, updated={p.rows_updated}")
+
+    progress = run_backfill(
+        engine,
+        job=args.job,
+        chunk_size=args.chunk_size,
+        sleep_seconds=args.sleep,
+        max_chunks=args.max_chunks,
+        on_progress=report,
+    )
+    print(f"[{args.job}] {'complete' if progress.done else 'paused'}: {progress}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Transactional outbox for audit records.
+
+With `AUDIT_OUTBOX_ENABLED`, the item routes stage each audit record as an
+`audit_outbox` row through the request session, so the item and its audit
+record share one transaction, one commit and one pooled connection. The
+`OutboxRelay` background task then moves staged records into `item_audit`
+in bulk: every poll it locks a batch of outbox rows (`FOR UPDATE SKIP LOCKED`
+on Postgres, so several workers can relay concurrently), inserts them with
+one executemany and deletes them, all in one transaction.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional
+
+from sqlalchemy import delete, insert, select
+
+from app import models
+from app.services import audit as audit_service
+
+
+_log = logging.getLogger(__name__)
+
+
+async def stage_audit_records(db, values_list: List[dict]) -> None:
+    """Add audit insert values (see `build_insert_values`) to the outbox via `db`.
+
+    Does not commit; the caller's commit makes the records durable together
+    with the rows they describe.
+    """
+    if values_list:
+        await db.execute(insert(models.AuditOutbox), [{"record": values} for values in values_list])
+
+
+def _relay_batch_on_connection(conn, engine, batch_size: int) -> int:
+    outbox = models.AuditOutbox.__table__
+    stmt = (
+        select(outbox.c.id, outbox.c.record, outbox.c.created_at)
+        .order_by(outbox.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    rows = conn.execute(stmt).fetchall()
+    if not rows:
+        return 0
+    # item_audit.created_at is when the record was staged (the event), not when it is relayed
+    audit_service._insert_audit_many_on_connection(
+        conn, engine, [{**row.record, "created_at": row.created_at} for row in rows]
+    )
+    conn.execute(delete(outbox).where(outbox.c.id.in_([row.id for row in rows])))
+    return len(rows)
+
+
+async def relay_outbox_once(engine, batch_size: int = 1000) -> int:
+    """Move up to `batch_size` outbox records to `item_audit`; return how many moved."""
+    async with engine.begin() as conn:
+        return await conn.run_sync(_relay_batch_on_connection, engine, batch_size)
+
+
+class OutboxRelay:
+    """Background task that drains the outbox every `interval_ms` milliseconds."""
+
+    def __init__(self, *, batch_size: int = 1000, interval_ms: int = 500, engine=None):
+        self.batch_size = max(1, batch_size)
+        self.interval = max(0, interval_ms) / 1000.0
+        # None means "resolve app.db.async_engine at relay time" (tests may swap it)
+        self._engine = engine
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self.relayed = 0
+        self.failures = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "OutboxRelay":
+        return cls(
+            batch_size=getattr(settings, "AUDIT_OUTBOX_BATCH_SIZE", 1000),
+            interval_ms=getattr(settings, "AUDIT_OUTBOX_RELAY_MS", 500),
+        )
+
+    def _get_engine(self):
+        if self._engine is not None:
+            return self._engine
+        import app.db as app_db
+
+        return app_db.async_engine
+
+    async def drain(self) -> int:
+        """Relay until the outbox is empty; return the number of records moved."""
+        moved = 0
+        while True:
+            n = await relay_outbox_once(self._get_engine(), self.batch_size)
+            moved += n
+            self.relayed += n
+            if n < self.batch_size:
+                return moved
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="audit-outbox-relay")
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        # final pass so records committed just before shutdown aren't left behind
+        try:
+            await self.drain()
+        except Exception:
+            _log.exception("Final audit outbox drain failed")
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.drain()
+            except Exception:
+                self.failures += 1
+                _log.exception("Audit outbox relay failed; will retry")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
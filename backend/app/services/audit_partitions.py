@@ -0,0 +1,208 @@
+"""Partition maintenance for the range-partitioned `item_audit` table (Postgres).
+
+Migration 0008 turns `item_audit` into a table partitioned by `created_at`,
+one partition per month or per day (`AUDIT_PARTITION_INTERVAL`). This module
+keeps the partition set rolling:
+
+- `ensure_partitions` pre-creates the current and the next `ahead` partitions,
+  so inserts never land in the catch-all `item_audit_default` partition;
+- `apply_retention` detaches or drops whole partitions that ended before the
+  retention window, which is a catalog operation instead of a large DELETE.
+
+Partition names encode their lower bound (`item_audit_p2026_10` or
+`item_audit_p2026_10_17`), so the bounds can be recovered without parsing
+`pg_get_expr` output.
+
+Usage (from backend/), e.g. daily from cron:
+  python -m app.services.audit_partitions [--ahead N] [--retention N] [--detach] [--dry-run]
+"""
+
+import argparse
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+
+_log = logging.getLogger(__name__)
+
+PARENT_TABLE = "item_audit"
+DEFAULT_PARTITION = "item_audit_default"
+INTERVALS = ("month", "day")
+
+_NAME_RE = re.compile(r"^item_audit_p(\d{4})_(\d{2})(?:_(\d{2}))?$")
+
+
+def _check_interval(interval: str) -> str:
+    if interval not in INTERVALS:
+        raise ValueError(f"partition interval must be one of {INTERVALS}, got {interval!r}")
+    return interval
+
+
+def period_start(day: date, interval: str) -> date:
+    """Return the first day of the partition period containing `day`."""
+    _check_interval(interval)
+    return day.replace(day=1) if interval == "month" else day
+
+
+def next_period(start: date, interval: str) -> date:
+    if _check_interval(interval) == "day":
+        return date.fromordinal(start.toordinal() + 1)
+    if start.month == 12:
+        return date(start.year + 1, 1, 1)
+    return date(start.year, start.month + 1, 1)
+
+
+def shift_period(start: date, interval: str, n: int) -> date:
+    """Move `start` (a period start) by `n` periods, backwards when `n` is negative."""
+    if _check_interval(interval) == "day":
+        return date.fromordinal(start.toordinal() + n)
+    months = start.year * 12 + (start.month - 1) + n
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def partition_name(start: date, interval: str) -> str:
+    if _check_interval(interval) == "month":
+        return f"{PARENT_TABLE}_p{start:%Y_%m}"
+    return f"{PARENT_TABLE}_p{start:%Y_%m_%d}"
+
+
+def parse_partition_name(name: str) -> Optional[Tuple[date, str]]:
+    """Return (lower bound, interval) for a managed partition name, else None."""
+    m = _NAME_RE.match(name)
+    if not m:
+        return None
+    year, month, day = m.groups()
+    if day is None:
+        return date(int(year), int(month), 1), "month"
+    return date(int(year), int(month), int(day)), "day"
+
+
+def partition_periods(first: date, last: date, interval: str) -> List[date]:
+    """Return the period starts covering `first`..`last` inclusive."""
+    start = period_start(first, interval)
+    end = period_start(last, interval)
+    periods = []
+    while start <= end:
+        periods.append(start)
+        start = next_period(start, interval)
+    return periods
+
+
+def create_partition_sql(start: date, interval: str) -> str:
+    # bounds are dates rendered by us, never user input, so inlining is safe (DDL can't bind
+    # them); periods are UTC regardless of the session TimeZone
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(start, interval)}" '
+        f'PARTITION OF "{PARENT_TABLE}" '
+        f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') "
+        f"TO ('{next_period(start, interval).isoformat()} 00:00:00+00')"
+    )
+
+
+def expired_partitions(names: Iterable[str], today: date, interval: str, retention: int) -> List[str]:
+    """Return managed partitions that ended before the last `retention` periods.
+
+    The current period counts as one of the `retention` periods; `retention <= 0`
+    keeps everything. Names of other intervals or unmanaged tables are ignored.
+    """
+    if retention <= 0:
+        return []
+    cutoff = shift_period(period_start(today, interval), interval, -(retention - 1))
+    expired = []
+    for name in names:
+        parsed = parse_partition_name(name)
+        if parsed is None or parsed[1] != interval:
+            continue
+        if next_period(parsed[0], interval) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+def list_partitions(conn) -> List[str]:
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent ORDER BY c.relname"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    return [row[0] for row in rows]
+
+
+def ensure_partitions(conn, interval: str, *, ahead: int = 3, today: Optional[date] = None, dry_run: bool = False) -> List[str]:
+    """Create the current and next `ahead` partitions; return the names created."""
+    today = today or datetime.now(timezone.utc).date()
+    existing = set(list_partitions(conn))
+    first = period_start(today, interval)
+    created = []
+    for n in range(ahead + 1):
+        start = shift_period(first, interval, n)
+        name = partition_name(start, interval)
+        if name in existing:
+            continue
+        if not dry_run:
+            conn.execute(text(create_partition_sql(start, interval)))
+        created.append(name)
+    return created
+
+
+def apply_retention(
+    conn,
+    interval: str,
+    retention: int,
+    *,
+    detach: bool = False,
+    today: Optional[date] = None,
+    dry_run: bool = False,
+) -> List[str]:
+    """Drop (or detach, keeping the table for archival) expired partitions; return their names."""
+    today = today or datetime.now(timezone.utc).date()
+    expired = expired_partitions(list_partitions(conn), today, interval, retention)
+    if not dry_run:
+        for name in expired:
+            if detach:
+                conn.execute(text(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"'))
+            else:
+                conn.execute(text(f'DROP TABLE "{name}"'))
+    return expired
+
+
+def main(argv=None):
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="defaults to settings.DATABASE_URL")
+    parser.add_argument("--interval", choices=INTERVALS, default=getattr(settings, "AUDIT_PARTITION_INTERVAL", "month"))
+    parser.add_argument("--ahead", type=int, default=getattr(settings, "AUDIT_PARTITION_PREMAKE", 3), help="future partitions to pre-create")
+    parser.add_argument(
+        "--retention",
+        type=int,
+        default=getattr(settings, "AUDIT_PARTITION_RETENTION", 0),
+        help="partitions (periods) to keep, including the current one; 0 keeps everything",
+    )
+    parser.add_argument("--detach", action="store_true", help="detach expired partitions instead of dropping them")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, pool_pre_ping=True)
+    if engine.dialect.name != "postgresql":
+        parser.error("item_audit partitioning is only supported on Postgres")
+
+    with engine.begin() as conn:
+        created = ensure_partitions(conn, args.interval, ahead=args.ahead, dry_run=args.dry_run)
+        removed = apply_retention(conn, args.interval, args.retention, detach=args.detach, dry_run=args.dry_run)
+
+    prefix = "[dry-run] " if args.dry_run else ""
+    print(f"{prefix}created: {', '.join(created) or '-'}")
+    print(f"{prefix}{'detached' if args.detach else 'dropped'}: {', '.join(removed) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Per-request audit policy: whether to record an audit row, and how much of it.
+
+Read from settings on every call, so changing them (env + restart, or
+`monkeypatch` in tests) needs no code change:
+
+- `AUDIT_ENABLED=0` or `AUDIT_POLICY=off`: nothing is audited;
+- `AUDIT_POLICY=full` (default): typed columns plus the full payload;
+- `AUDIT_POLICY=metadata`: typed columns only, without `user_agent` or payload;
+- `AUDIT_SAMPLE_RATE` (0.0-1.0) keeps that fraction of requests, and
+  `AUDIT_SAMPLE_RULES` overrides it per route and method, e.g.
+  `/items:POST=0.1;/items/batch:POST=1;*:POST=0.5` (`*` matches any path).
+
+Sampling is per request, so a batch request is audited entirely or not at all.
+Counters of recorded and skipped requests are kept per process (`stats()`).
+"""
+
+import random
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+
+
+FULL = "full"
+METADATA = "metadata"
+OFF = "off"
+LEVELS = (FULL, METADATA, OFF)
+
+_counters: Dict[str, int] = {"recorded": 0, "sampled_out": 0, "disabled": 0}
+_rules_cache: Tuple[Optional[str], Dict[Tuple[str, str], float]] = (None, {})
+
+
+def _parse_sample_rules(raw: Optional[str]) -> Dict[Tuple[str, str], float]:
+    """Parse `path:METHOD=rate;...` into {(path, METHOD): rate}; bad entries are skipped."""
+    rules = {}
+    for part in (raw or "").split(";"):
+        target, sep, rate = part.strip().rpartition("=")
+        path, colon, method = target.rpartition(":")
+        if not sep or not colon or not path:
+            continue
+        try:
+            rules[(path.strip(), method.strip().upper())] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rules
+
+
+def _sample_rules() -> Dict[Tuple[str, str], float]:
+    # parsed once per distinct setting value
+    global _rules_cache
+    raw = getattr(settings, "AUDIT_SAMPLE_RULES", "")
+    if _rules_cache[0] != raw:
+        _rules_cache = (raw, _parse_sample_rules(raw))
+    return _rules_cache[1]
+
+
+def sample_rate(path: Optional[str], method: Optional[str]) -> float:
+    rules = _sample_rules()
+    method = (method or "").upper()
+    if rules:
+        for key in ((path, method), ("*", method)):
+            if key in rules:
+                return rules[key]
+    return float(getattr(settings, "AUDIT_SAMPLE_RATE", 1.0))
+
+
+def decide(path: Optional[str], method: Optional[str]) -> Optional[str]:
+    """Return the verbosity to audit this request with (`full`/`metadata`), or None to skip it."""
+    level = getattr(settings, "AUDIT_POLICY", FULL)
+    if not getattr(settings, "AUDIT_ENABLED", True) or level == OFF:
+        _counters["disabled"] += 1
+        return None
+    rate = sample_rate(path, method)
+    if rate < 1.0 and random.random() >= rate:
+        _counters["sampled_out"] += 1
+        return None
+    _counters["recorded"] += 1
+    return METADATA if level == METADATA else FULL
+
+
+def stats() -> Dict[str, int]:
+    return dict(_counters)
+
+
+def reset_stats() -> None:
+    for key in _counters:
+        _counters[key] = 0
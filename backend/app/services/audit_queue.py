@@ -0,0 +1,144 @@
+"""In-process, batched audit writer.
+
+Request handlers call `AuditBatchWriter.submit()`, which only puts the audit
+values on a bounded `asyncio.Queue`. A background task drains the queue and
+writes rows with one multi-row INSERT every `batch_size` records or
+`flush_interval_ms` milliseconds, whichever comes first, so the audit write
+is off the request's critical path.
+
+When the queue is full `submit()` waits up to `put_timeout_ms` (backpressure)
+and then drops the record, counting it in `dropped`; `put_timeout_ms=0`
+drops immediately. `close()` drains everything already queued.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from app.services import audit as audit_service
+from app.services import audit_policy
+
+
+_log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditBatchWriter:
+    def __init__(
+        self,
+        *,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval_ms: int = 200,
+        put_timeout_ms: int = 50,
+        engine=None,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0, flush_interval_ms) / 1000.0
+        self.put_timeout = max(0, put_timeout_ms) / 1000.0
+        # None means "resolve app.db.async_engine at flush time" (tests may swap it)
+        self._engine = engine
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue))
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "AuditBatchWriter":
+        return cls(
+            max_queue=getattr(settings, "AUDIT_QUEUE_MAX_SIZE", 10000),
+            batch_size=getattr(settings, "AUDIT_QUEUE_BATCH_SIZE", 500),
+            flush_interval_ms=getattr(settings, "AUDIT_QUEUE_FLUSH_MS", 200),
+            put_timeout_ms=getattr(settings, "AUDIT_QUEUE_PUT_TIMEOUT_MS", 50),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._closing
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="audit-batch-writer")
+
+    async def submit(self, db_item, payload_metadata: dict, verbosity: str = audit_policy.FULL) -> bool:
+        """Queue one audit record; return False when it was dropped."""
+        return await self.submit_values(
+            audit_service.build_insert_values(db_item, payload_metadata, verbosity=verbosity)
+        )
+
+    async def submit_values(self, values: dict) -> bool:
+        try:
+            self._queue.put_nowait(values)
+            return True
+        except asyncio.QueueFull:
+            pass
+        if self.put_timeout > 0:
+            try:
+                await asyncio.wait_for(self._queue.put(values), self.put_timeout)
+                return True
+            except asyncio.TimeoutError:
+                pass
+        self.dropped += 1
+        if self.dropped == 1 or self.dropped % 1000 == 0:
+            _log.warning("Audit queue full; dropped %s audit records so far", self.dropped)
+        return False
+
+    async def close(self) -> None:
+        """Stop accepting records, flush everything queued and wait for the task."""
+        if self._task is None:
+            return
+        self._closing = True
+        if not self._task.done():
+            await self._queue.put(_STOP)
+            await self._task
+        _log.info("Audit batch writer stopped: %s", self.stats())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stop = False
+        while not stop:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout <= 0:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[dict]) -> None:
+        engine = self._engine
+        if engine is None:
+            import app.db as app_db
+
+            engine = app_db.async_engine
+        result = await audit_service.insert_audit_values_many_async(engine, batch)
+        self.flushes += 1
+        if result.success:
+            self.written += len(batch)
+        else:
+            self.failed += len(batch)
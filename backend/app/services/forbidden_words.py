@@ -0,0 +1,306 @@
+"""Forbidden-word matching with an Aho-Corasick automaton.
+
+All words are compiled into one automaton, so scanning a text costs
+O(len(text)) (plus the matches reported) however many words are configured;
+a 50k-term moderation list scans as fast as a 5-word one.
+
+Words come from `FORBIDDEN_WORDS` and, optionally, `FORBIDDEN_WORDS_FILE`
+(UTF-8, one word per line, `#` starts a comment). Matching is tuned by:
+
+- `FORBIDDEN_WORDS_MATCH`: `substring` (default, a word matches anywhere) or
+  `word` (only whole words: no letter, digit or `_` directly before or after),
+  case-insensitive; `check_settings()` rejects anything else at start-up;
+- `FORBIDDEN_WORDS_NORMALIZE`: when true, words and text are NFKC-normalized
+  and case-folded, so full-width or compatibility forms (`ＳＰＡＭ`, `ﬁ`) match
+  too; otherwise matching is case-insensitive via `str.lower()`.
+
+`get_matcher()` returns the current automaton. When one of the settings above
+is reassigned, or `FORBIDDEN_WORDS_RELOAD_S` > 0 and the words file's mtime
+changed, it starts a rebuild in a background thread and keeps returning the
+current automaton until the new one is swapped in, so requests never wait on
+a build and see either the old or the new word list, never a mix. `reload()`
+rebuilds synchronously. A words file that can't be read on the first build
+is logged and only `FORBIDDEN_WORDS` is used.
+"""
+
+import logging
+import os
+import threading
+import time
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+
+import app.config as conf
+
+
+_log = logging.getLogger(__name__)
+
+SUBSTRING = "substring"
+WORD = "word"
+
+# transitions are stored in one dict keyed by `state << _CHAR_BITS | ord(ch)`,
+# far smaller than a dict per trie node for large word lists
+_CHAR_BITS = 21  # enough for every Unicode code point
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class ForbiddenWordMatcher:
+    """Immutable Aho-Corasick automaton over a set of words."""
+
+    def __init__(self, words: Iterable[str], *, mode: str = SUBSTRING, normalize: bool = False):
+        if mode not in (SUBSTRING, WORD):
+            raise ValueError(f"unknown match mode: {mode!r}")
+        self.mode = mode
+        self.normalize = normalize
+
+        # goto function, failure links and, per state, the lengths of the words ending there
+        delta = {}
+        out: List[Tuple[int, ...]] = [()]
+        self.words: List[str] = []
+        seen = set()
+        for word in words:
+            key = self._fold(str(word).strip())
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self.words.append(key)
+            state = 0
+            for ch in key:
+                edge = state << _CHAR_BITS | ord(ch)
+                nxt = delta.get(edge)
+                if nxt is None:
+                    nxt = len(out)
+                    delta[edge] = nxt
+                    out.append(())
+                state = nxt
+            out[state] = (len(key),)
+
+        # breadth-first over the trie: the failure link of a state is the longest
+        # proper suffix of its path that is also a trie path
+        children: List[List[Tuple[int, int]]] = [[] for _ in out]
+        for edge, nxt in delta.items():
+            children[edge >> _CHAR_BITS].append((edge & ((1 << _CHAR_BITS) - 1), nxt))
+        fail = [0] * len(out)
+        queue = [nxt for _, nxt in children[0]]
+        for state in queue:
+            for code, nxt in children[state]:
+                f = fail[state]
+                while f and (f << _CHAR_BITS | code) not in delta:
+                    f = fail[f]
+                fail[nxt] = delta.get(f << _CHAR_BITS | code, 0)
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+                queue.append(nxt)
+
+        self._delta = delta
+        self._fail = fail
+        self._out = out
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _fold(self, text: str) -> str:
+        if self.normalize:
+            return unicodedata.normalize("NFKC", text).casefold()
+        return text.lower()
+
+    def find(self, text: str) -> Optional[str]:
+        """Return the first forbidden word found in `text`, or None."""
+        if len(self._out) == 1:
+            return None
+        text = self._fold(text)
+        delta, fail, out = self._delta, self._fail, self._out
+        whole_words = self.mode == WORD
+        state = 0
+        for end, ch in enumerate(text, 1):
+            code = ord(ch)
+            nxt = delta.get(state << _CHAR_BITS | code)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = delta.get(state << _CHAR_BITS | code)
+            state = nxt or 0
+            for length in out[state]:
+                start = end - length
+                if whole_words and (
+                    (start > 0 and _is_word_char(text[start - 1]))
+                    or (end < len(text) and _is_word_char(text[end]))
+                ):
+                    continue
+                return text[start:end]
+        return None
+
+    def __contains__(self, text: str) -> bool:
+        return self.find(text) is not None
+
+
+def load_words_file(path: str) -> List[str]:
+    """Read one word per line; blank lines and `#` comments are ignored."""
+    words = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            word = line.split("#", 1)[0].strip()
+            if word:
+                words.append(word)
+    return words
+
+
+def _configured_words() -> List[str]:
+    fw = getattr(conf.settings, "FORBIDDEN_WORDS", None) or []
+    if isinstance(fw, str):
+        fw = fw.split(",")
+    return [str(w).strip() for w in fw if str(w).strip()]
+
+
+def _file_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class _State:
+    # settings values the current matcher was built from
+    key: tuple = ()
+    # the FORBIDDEN_WORDS value itself, so its id in `key` can't be reused
+    words_ref = None
+    matcher: Optional[ForbiddenWordMatcher] = None
+    file_mtime: Optional[int] = None
+    next_check: float = 0.0
+    # set while a background rebuild is running
+    building: bool = False
+    # settings a background rebuild rejected as invalid; not retried until they change
+    rejected_key: tuple = ()
+
+
+_state = _State()
+_lock = threading.Lock()
+# guards `building` only, so scheduling never waits for a running build
+_schedule_lock = threading.Lock()
+
+
+def _match_mode() -> str:
+    # `Word` / ` WORD ` in an env file mean the same as `word`
+    return str(getattr(conf.settings, "FORBIDDEN_WORDS_MATCH", "") or SUBSTRING).strip().lower()
+
+
+def _settings_key() -> tuple:
+    # read through the module so a reloaded `app.config` is picked up
+    settings = conf.settings
+    return (
+        id(getattr(settings, "FORBIDDEN_WORDS", None)),
+        getattr(settings, "FORBIDDEN_WORDS_FILE", "") or "",
+        _match_mode(),
+        bool(getattr(settings, "FORBIDDEN_WORDS_NORMALIZE", False)),
+    )
+
+
+def check_settings() -> None:
+    """Raise ValueError when `FORBIDDEN_WORDS_MATCH` is not a known mode.
+
+    Called by `create_app()` so a typo stops start-up with a clear message
+    instead of failing every validated request.
+    """
+    mode = _match_mode()
+    if mode not in (SUBSTRING, WORD):
+        raise ValueError(
+            f"FORBIDDEN_WORDS_MATCH must be {SUBSTRING!r} or {WORD!r}, "
+            f"got {getattr(conf.settings, 'FORBIDDEN_WORDS_MATCH', None)!r}"
+        )
+
+
+def build_matcher(*, fallback: bool = False) -> ForbiddenWordMatcher:
+    """Build a matcher from the current settings (and words file).
+
+    With `fallback`, an unreadable words file is logged and only
+    `FORBIDDEN_WORDS` is used instead of raising.
+    """
+    _, path, mode, normalize = _settings_key()
+    words = _configured_words()
+    if path:
+        try:
+            words.extend(load_words_file(path))
+        except (OSError, UnicodeDecodeError):
+            if not fallback:
+                raise
+            _log.exception("Reading %s failed; using FORBIDDEN_WORDS only", path)
+    return ForbiddenWordMatcher(words, mode=mode, normalize=normalize)
+
+
+def _swap(state: _State, *, fallback: bool = False) -> ForbiddenWordMatcher:
+    # caller holds `_lock`
+    key = _settings_key()
+    mtime = _file_mtime(key[1]) if key[1] else None
+    started = time.perf_counter()
+    matcher = build_matcher(fallback=fallback)
+    state.words_ref = getattr(conf.settings, "FORBIDDEN_WORDS", None)
+    state.key, state.file_mtime, state.matcher = key, mtime, matcher
+    _log.info("Forbidden-word matcher built: %d words in %.3fs", len(matcher), time.perf_counter() - started)
+    return matcher
+
+
+def reload() -> ForbiddenWordMatcher:
+    """Rebuild from settings and the words file, then swap the new matcher in."""
+    with _lock:
+        return _swap(_state)
+
+
+def _rebuild_in_background(state: _State, settings_changed: bool) -> None:
+    key = _settings_key()
+    try:
+        with _lock:
+            # new settings replace the old word list even if their file can't be
+            # read; a failed re-read of the same file keeps the previous list
+            _swap(state, fallback=settings_changed)
+    except (OSError, UnicodeDecodeError):
+        _log.warning("Reloading %s failed; keeping the previous word list", state.key[1], exc_info=True)
+    except ValueError as exc:
+        # e.g. an unknown FORBIDDEN_WORDS_MATCH set at runtime: retrying won't help
+        state.rejected_key = key
+        _log.error("Forbidden-word settings rejected (%s); keeping the previous word list", exc)
+    except Exception:
+        _log.exception("Rebuilding the forbidden-word matcher failed")
+    finally:
+        state.building = False
+
+
+def _schedule_rebuild(settings_changed: bool) -> None:
+    state = _state
+    with _schedule_lock:
+        if state.building:
+            return
+        state.building = True
+    threading.Thread(
+        target=_rebuild_in_background, args=(state, settings_changed), name="forbidden-words-rebuild", daemon=True
+    ).start()
+
+
+def get_matcher() -> ForbiddenWordMatcher:
+    """Return the current matcher; changed inputs are rebuilt in a background thread.
+
+    Only the very first call (normally the start-up warm-up, off the event
+    loop) builds synchronously; it falls back to `FORBIDDEN_WORDS` alone when
+    the words file can't be read.
+    """
+    matcher = _state.matcher
+    if matcher is None:
+        with _lock:
+            if _state.matcher is None:
+                return _swap(_state, fallback=True)
+            return _state.matcher
+    key = _settings_key()
+    if _state.key != key:
+        if key != _state.rejected_key:
+            _schedule_rebuild(settings_changed=True)
+        return matcher
+    interval = float(getattr(conf.settings, "FORBIDDEN_WORDS_RELOAD_S", 0) or 0)
+    path = _state.key[1]
+    if interval > 0 and path:
+        now = time.monotonic()
+        if now >= _state.next_check:
+            _state.next_check = now + interval
+            if _file_mtime(path) != _state.file_mtime:
+                _schedule_rebuild(settings_changed=False)
+    return matcher
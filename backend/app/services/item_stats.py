@@ -0,0 +1,82 @@
+"""Cheap item counts for dashboards and `HEAD /items`.
+
+- exact counts run `SELECT count(*)` and are cached per engine for
+  `ITEMS_COUNT_CACHE_TTL` seconds;
+- estimates read `pg_class.reltuples` on Postgres (kept current by
+  autovacuum/ANALYZE, O(1) regardless of table size). On other dialects they
+  are an in-process counter: the last exact count plus this process's own
+  creates (`note_items_created`), re-seeded from `count(*)` whenever the
+  exact count's TTL expires. Other workers' creates therefore show up within
+  `ITEMS_COUNT_CACHE_TTL` seconds and per-process counts can't drift apart.
+"""
+
+import time
+from typing import Dict, Tuple
+
+from sqlalchemy import func, select, text
+
+from app import models
+from app.config import settings
+
+
+_exact_cache: Dict[int, Tuple[int, float]] = {}
+_counters: Dict[int, int] = {}
+
+_RELTUPLES_SQL = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+)
+
+
+def _key(db) -> int:
+    # cache per engine identity, like the audit table cache
+    return id(db.bind)
+
+
+async def _count_exact(db) -> int:
+    return (await db.execute(select(func.count()).select_from(models.Item))).scalar_one()
+
+
+async def exact_count(db) -> int:
+    """Return `count(*)` of items, served from a short-lived per-engine cache."""
+    key = _key(db)
+    cached = _exact_cache.get(key)
+    now = time.monotonic()
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    count = await _count_exact(db)
+    _exact_cache[key] = (count, now + settings.ITEMS_COUNT_CACHE_TTL)
+    _counters[key] = count
+    return count
+
+
+async def estimated_count(db) -> Tuple[int, bool]:
+    """Return `(count, is_exact)` without scanning the items table when possible."""
+    key = _key(db)
+    if db.bind.dialect.name == "postgresql":
+        reltuples = (
+            await db.execute(_RELTUPLES_SQL, {"table": models.Item.__tablename__})
+        ).scalar()
+        # -1 (PG 14+) / 0 means the table was never vacuumed or analyzed
+        if reltuples is not None and reltuples > 0:
+            return int(reltuples), False
+        return await exact_count(db), True
+
+    cached = _exact_cache.get(key)
+    if key not in _counters or cached is None or cached[1] <= time.monotonic():
+        # re-seed from the database so creates by other processes are counted
+        return await exact_count(db), True
+    return _counters[key], False
+
+
+def note_items_created(db, n: int) -> None:
+    """Record `n` committed inserts in this process's counter until its next re-seed."""
+    key = _key(db)
+    if key in _counters:
+        _counters[key] += n
+
+
+async def count_items(db, exact: bool = False) -> Tuple[int, bool]:
+    """Return `(count, is_exact)`; `exact=True` always yields an exact (cached) count."""
+    if exact:
+        return await exact_count(db), True
+    return await estimated_count(db)
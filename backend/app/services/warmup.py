@@ -0,0 +1,144 @@
+"""Startup warm-up run from the FastAPI lifespan before the app reports ready.
+
+Without it the first requests after a deploy pay for work that every later
+request gets for free: reflecting `item_audit`, opening pooled connections
+and compiling statements into SQLAlchemy's per-engine compiled cache. The
+warm-up does that work up front:
+
+1. reflects (or creates) `item_audit` and caches its `AuditWriter`;
+2. opens up to `DB_POOL_SIZE` async connections at once, so the pool is full;
+3. executes the hot write statements (item INSERT, audit INSERT) inside
+   transactions that are rolled back, which fills the compiled cache without
+   leaving rows behind (a Postgres sequence value may be consumed);
+4. builds the forbidden-word automaton (app/services/forbidden_words.py);
+5. sends read requests through the whole ASGI stack (middleware, routing,
+   response classes) in-process.
+
+`/ready` (app/routes/health.py) reports ready only once this has finished.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import Dict
+
+from sqlalchemy import text
+
+from app import models
+from app.config import settings
+from app.services import audit as audit_service
+from app.services import audit_policy
+from app.services import forbidden_words
+
+
+_log = logging.getLogger(__name__)
+
+# Read endpoints exercised in-process; they touch the hot SELECTs and every middleware
+WARMUP_REQUESTS = ("/items?limit=1", "/items/count")
+# only mounted with AUDIT_API_ENABLED
+AUDIT_WARMUP_REQUESTS = ("/audit?limit=1",)
+
+
+async def _reflect_audit_table(engine) -> None:
+    async with engine.connect() as conn:
+        await conn.run_sync(lambda sync_conn: audit_service.get_audit_writer(engine, bind=sync_conn))
+
+
+async def _prime_pool(engine, size: int) -> int:
+    """Open `size` connections concurrently, then return them to the pool."""
+    async with AsyncExitStack() as stack:
+        opened = await asyncio.gather(
+            *(engine.connect().start() for _ in range(max(1, size))), return_exceptions=True
+        )
+        conns = [conn for conn in opened if not isinstance(conn, BaseException)]
+        for conn in conns:
+            stack.push_async_callback(conn.close)
+        # close whatever did open before reporting a failed connect
+        for result in opened:
+            if isinstance(result, BaseException):
+                raise result
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in conns))
+        return len(conns)
+
+
+async def _compile_write_statements(engine, session_factory) -> None:
+    async with session_factory() as session:
+        session.add(models.Item(name="warmup"))
+        await session.flush()
+        await session.rollback()
+
+    values = audit_service.build_insert_values(
+        None, {"name": "warmup"}, verbosity=audit_policy.FULL
+    )
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            await conn.run_sync(audit_service._insert_audit_on_connection, engine, values, False)
+        finally:
+            await trans.rollback()
+
+
+async def _warm_requests(app) -> None:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+        paths = WARMUP_REQUESTS
+        if getattr(settings, "AUDIT_API_ENABLED", False):
+            paths += AUDIT_WARMUP_REQUESTS
+        for path in paths:
+            resp = await client.get(path)
+            if resp.status_code >= 500:
+                raise RuntimeError(f"warm-up request {path} returned {resp.status_code}")
+
+
+async def warm_up(app) -> Dict[str, float]:
+    """Run every warm-up step and return the seconds each one took."""
+    # import app.db here so we get the current engine value (tests may swap it)
+    import app.db as app_db
+
+    engine = app_db.async_engine
+    timings: Dict[str, float] = {}
+    steps = (
+        ("reflect", lambda: _reflect_audit_table(engine)),
+        ("pool", lambda: _prime_pool(engine, settings.DB_POOL_SIZE)),
+        ("statements", lambda: _compile_write_statements(engine, app_db.AsyncSessionLocal)),
+        ("forbidden_words", lambda: asyncio.to_thread(forbidden_words.get_matcher)),
+        ("requests", lambda: _warm_requests(app)),
+    )
+    for name, step in steps:
+        started = time.perf_counter()
+        await step()
+        timings[name] = round(time.perf_counter() - started, 4)
+    return timings
+
+
+async def warm_up_until_ready(app, *, timeout: float, retry_interval: float) -> None:
+    """Warm up and set `app.state.ready`; on failure keep retrying in the background.
+
+    A failed first attempt (e.g. the database is still starting) must not block
+    startup forever, nor leave the instance permanently unready.
+    """
+    try:
+        timings = await asyncio.wait_for(warm_up(app), timeout)
+    except Exception:
+        _log.exception("Warm-up failed; retrying every %ss", retry_interval)
+        app.state.warmup_task = asyncio.create_task(
+            _retry(app, timeout, retry_interval), name="warmup-retry"
+        )
+        return
+    app.state.ready = True
+    _log.info("Warm-up finished: %s", timings)
+
+
+async def _retry(app, timeout: float, retry_interval: float) -> None:
+    while not getattr(app.state, "ready", False):
+        await asyncio.sleep(retry_interval)
+        try:
+            timings = await asyncio.wait_for(warm_up(app), timeout)
+        except Exception:
+            _log.warning("Warm-up attempt failed", exc_info=True)
+            continue
+        app.state.ready = True
+        _log.info("Warm-up finished: %s", timings)
@@ -1,14 +1,69 @@
+import base64
+import json
 import re
+from typing import Iterable, List
+
+
+_TAG_RE = re.compile(r"<[^>]*>")
+# control chars except newline/tab/carriage return, deleted with str.translate
+_CONTROL_CHARS = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
 
 
 def sanitize(s: str) -> str:
+    """Remove HTML tags and control characters, collapse whitespace to single spaces and trim.
+
+    Strings that are already clean (the common case) are returned as-is after
+    a few C-level checks: `isprintable()` rules out control characters and any
+    whitespace other than a plain space.
+    """
+    if s.isprintable() and "<" not in s and "  " not in s and s[:1] != " " and s[-1:] != " ":
+        return s
     # remove HTML tags
-    s = re.sub(r"<[^>]*>", "", s)
+    if "<" in s:
+        s = _TAG_RE.sub("", s)
     # remove control chars except newline/tab/space
-    s = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", s)
-    # normalize whitespace
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    s = s.translate(_CONTROL_CHARS)
+    # normalize whitespace (str.split() splits on the same characters as `\s`)
+    return " ".join(s.split())
+
+
+def sanitize_many(values: Iterable[str]) -> List[str]:
+    """`sanitize` every string in `values`, for batch inputs."""
+    clean = sanitize
+    return [clean(v) for v in values]
+
+
+def encode_cursor(values: dict) -> str:
+    """Encode keyset position `values` into an opaque, URL-safe cursor string."""
+    raw = json.dumps(values, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by `encode_cursor`; raise ValueError when malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+# ids outside a signed 64-bit integer can't be keyset positions in any backend
+_CURSOR_ID_MAX = 2**63 - 1
+
+
+def cursor_id(values: dict) -> int:
+    """Return the integer `id` of decoded cursor `values`; raise ValueError when invalid."""
+    value = values.get("id")
+    # bool is an int subclass; floats (e.g. 1e999 -> inf) are never valid ids
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("Invalid cursor")
+    if not -_CURSOR_ID_MAX - 1 <= value <= _CURSOR_ID_MAX:
+        raise ValueError("Invalid cursor")
+    return value
 
 
 def extract_request_metadata(request):
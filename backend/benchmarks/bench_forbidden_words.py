@@ -0,0 +1,56 @@
+"""Benchmark forbidden-word scanning: per-word loop vs. Aho-Corasick automaton.
+
+Usage (from backend/):
+  python benchmarks/bench_forbidden_words.py [N_WORDS] [REPEAT]
+
+Builds N synthetic words (a moderation-list-sized set by default) and scans
+item names of a few lengths with:
+- baseline: `any(w in text.lower() for w in words)` (what ValidationMiddleware did)
+- automaton: `ForbiddenWordMatcher.find` (app/services/forbidden_words.py)
+
+Neither finds a match, so every scan covers the whole text.
+"""
+
+import os
+import random
+import string
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.forbidden_words import ForbiddenWordMatcher  # noqa: E402
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng = random.Random(0)
+    # words contain a digit so they never occur in the letters-only texts below
+    words = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) + str(rng.randint(0, 9))
+        for _ in range(n)
+    ]
+
+    started = time.perf_counter()
+    matcher = ForbiddenWordMatcher(words)
+    print(f"{n} words; automaton built in {time.perf_counter() - started:.2f}s, best of {repeat}")
+
+    for length in (20, 100, 1000):
+        text = "".join(rng.choice(string.ascii_letters + " ") for _ in range(length))
+        low = text.lower()
+        cases = {
+            "baseline (loop over words)": lambda: any(w in low for w in words),
+            "automaton (ForbiddenWordMatcher)": lambda: matcher.find(text),
+        }
+        print(f"  text length {length}")
+        baseline = None
+        for label, fn in cases.items():
+            best = min(timeit.repeat(fn, number=10, repeat=repeat)) / 10
+            baseline = baseline or best
+            print(f"    {label:<35} {best * 1e6:10.1f} us  ({baseline / best:7.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark the `POST /items` validation layer: dict round trip vs. single pass.
+
+Usage (from backend/):
+  python benchmarks/bench_item_validation.py [N] [REPEAT]
+
+Validates N request bodies per case, without HTTP:
+- baseline: `json.loads` + `validate_item_payload` + `json.dumps` of the
+  replacement body + `ItemCreate(**validated)` in the route (the previous flow)
+- parse_item_json: one `TypeAdapter(ItemCreate).validate_json` on the raw bytes,
+  then sanitize + forbidden-word check (what the middleware does now)
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.middleware.validation import parse_item_json, validate_item_payload  # noqa: E402
+from app.schemas import ItemCreate  # noqa: E402
+from app.services.forbidden_words import ForbiddenWordMatcher  # noqa: E402
+
+
+def baseline(body: bytes, forbidden) -> ItemCreate:
+    validated, _ = validate_item_payload(json.loads(body), forbidden)
+    json.dumps(validated).encode()
+    return ItemCreate(**validated)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    forbidden = ForbiddenWordMatcher(["spam", "badword"])
+    mixes = {
+        "clean": [json.dumps({"name": f"item name {i}"}).encode() for i in range(n)],
+        "dirty": [json.dumps({"name": f"  <b>item</b>\tname {i} "}).encode() for i in range(n)],
+    }
+    print(f"{n} bodies, best of {repeat}")
+    for mix, bodies in mixes.items():
+        assert [parse_item_json(b, forbidden)[0] for b in bodies] == [baseline(b, forbidden) for b in bodies]
+        cases = {
+            "baseline (loads/validate/dumps/model)": lambda: [baseline(b, forbidden) for b in bodies],
+            "parse_item_json (validate_json)": lambda: [parse_item_json(b, forbidden) for b in bodies],
+        }
+        print(f"  {mix}")
+        base = None
+        for label, fn in cases.items():
+            best = min(timeit.repeat(fn, number=1, repeat=repeat))
+            base = base or best
+            print(f"    {label:<40} {best * 1000:8.2f} ms  ({base / best:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
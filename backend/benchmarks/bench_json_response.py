@@ -0,0 +1,47 @@
+"""Benchmark item list serialization: previous path vs. `app.responses`.
+
+Usage (from backend/):
+  python benchmarks/bench_json_response.py [N_ITEMS] [REPEAT]
+
+Compares, for N ORM `Item` instances:
+- baseline: `jsonable_encoder` + Starlette `JSONResponse` (what `read_items`
+  did before it had a response class)
+- ItemListResponse: one compiled `TypeAdapter(List[ItemRead])` call
+- FastJSONResponse: plain dicts rendered with orjson / pydantic-core
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app import models  # noqa: E402
+from app import responses  # noqa: E402
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    items = [models.Item(id=i, name=f"item-{i}") for i in range(n)]
+    dicts = [{"id": i.id, "name": i.name} for i in items]
+
+    cases = {
+        "baseline (jsonable_encoder + JSONResponse)": lambda: JSONResponse(jsonable_encoder(items)),
+        "ItemListResponse (TypeAdapter.dump_json)": lambda: responses.ItemListResponse(items),
+        "FastJSONResponse (dicts)": lambda: responses.FastJSONResponse(dicts),
+    }
+    backend = "orjson" if responses.orjson is not None else "pydantic-core"
+    print(f"{n} items, best of {repeat}; FastJSONResponse backend: {backend}")
+    baseline = None
+    for label, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        baseline = baseline or best
+        print(f"  {label:<45} {best * 1000:8.2f} ms  ({baseline / best:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark the middleware stack: BaseHTTPMiddleware vs. plain ASGI.
+
+Usage (from backend/):
+  python benchmarks/bench_middleware.py [N_REQUESTS] [REPEAT]
+
+Sends N requests in-process (httpx ASGITransport, no sockets) to a minimal
+app wrapped in the validation + security-headers middleware and reports
+requests/sec for:
+- before: the previous `BaseHTTPMiddleware` / `@app.middleware("http")` versions
+- after: `app.middleware.validation` / `app.middleware.security` (plain ASGI)
+
+for an unmatched `GET /ping` and a validated `POST /items`.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, Request  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.middleware import validation  # noqa: E402
+from app.middleware.security import DEFAULT_SECURITY_HEADERS, SecurityHeadersMiddleware  # noqa: E402
+from app.schemas import ItemCreate  # noqa: E402
+
+
+def _linear_match(rules, path: str, method: str) -> bool:
+    for pattern, m in rules:
+        if m != method:
+            continue
+        if pattern.endswith("*"):
+            if path.startswith(pattern[:-1]):
+                return True
+        elif path == pattern:
+            return True
+    return False
+
+
+class LegacyValidationMiddleware(BaseHTTPMiddleware):
+    """The pre-ASGI implementation (single-item path), kept here for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        _, rules = validation._get_config_from_settings()
+        rules = rules or [("/items", "POST"), ("/items/batch", "POST")]
+        if not _linear_match(rules, request.url.path, request.method.upper()):
+            return await call_next(request)
+        body_bytes = await request.body()
+        try:
+            data = json.loads(body_bytes) if body_bytes else {}
+        except Exception:
+            return validation._bad_request("Invalid JSON body")
+        validated, error = validation.validate_item_payload(data)
+        if error is not None:
+            return validation._bad_request(error)
+        new_body = json.dumps(validated).encode()
+
+        async def receive():
+            return {"type": "http.request", "body": new_body, "more_body": False}
+
+        request._receive = receive
+        request.state.validated_json = validated
+        return await call_next(request)
+
+
+def _ping_route(app: FastAPI) -> FastAPI:
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def build_before() -> FastAPI:
+    app = _ping_route(FastAPI())
+
+    @app.post("/items", status_code=201)
+    async def create(request: Request):
+        item_in = ItemCreate(**request.state.validated_json)
+        return {"name": item_in.name}
+
+    app.add_middleware(LegacyValidationMiddleware)
+    app.add_middleware(LegacyValidationMiddleware)
+
+    @app.middleware("http")
+    async def set_security_headers(request: Request, call_next):
+        response = await call_next(request)
+        for name, value in DEFAULT_SECURITY_HEADERS:
+            response.headers.setdefault(name, value)
+        return response
+
+    return app
+
+
+def build_after() -> FastAPI:
+    app = _ping_route(FastAPI())
+
+    @app.post("/items", status_code=201)
+    async def create(item_in: ItemCreate = Depends(validation.get_validated_item)):
+        return {"name": item_in.name}
+
+    app.add_middleware(validation.ValidationMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+    return app
+
+
+async def _run(app, n: int, method: str, path: str, body) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        for _ in range(n):
+            resp = await client.request(method, path, json=body)
+            assert resp.status_code < 300, resp.text
+        return time.perf_counter() - started
+
+
+def main():
+    # importing the app configures INFO logging; don't log every request
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    cases = (
+        ("GET /ping (unmatched)", "GET", "/ping", None),
+        ("POST /items (validated)", "POST", "/items", {"name": "  <b>hello</b> world"}),
+    )
+    apps = {"before (BaseHTTPMiddleware)": build_before(), "after (plain ASGI)": build_after()}
+    print(f"{n} requests, best of {repeat}")
+    for case, method, path, body in cases:
+        print(f"  {case}")
+        baseline = None
+        for label, app in apps.items():
+            best = min(asyncio.run(_run(app, n, method, path, body)) for _ in range(repeat))
+            baseline = baseline or best
+            print(f"    {label:<30} {n / best:9.0f} req/s  ({baseline / best:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark `app.utils.sanitize`: the previous three-pass version vs. the current one.
+
+Usage (from backend/):
+  python benchmarks/bench_sanitize.py [N_STRINGS] [REPEAT]
+
+Sanitizes N item names per input mix:
+- clean: already-sanitized names (the common case; hits the fast path)
+- dirty: names with tags, control characters and runs of whitespace
+and compares:
+- baseline: `re.sub` x3 per string (what `sanitize` did before)
+- sanitize: `[sanitize(s) for s in names]`
+- sanitize_many: `sanitize_many(names)`
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.utils import sanitize, sanitize_many  # noqa: E402
+
+
+def baseline_sanitize(s: str) -> str:
+    s = re.sub(r"<[^>]*>", "", s)
+    s = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    mixes = {
+        "clean": [f"item name {i}" for i in range(n)],
+        "dirty": [f"  <b>item</b>\tname\x00 {i}\n" for i in range(n)],
+    }
+    print(f"{n} strings, best of {repeat}")
+    for mix, names in mixes.items():
+        assert sanitize_many(names) == [baseline_sanitize(s) for s in names]
+        cases = {
+            "baseline (re.sub x3)": lambda: [baseline_sanitize(s) for s in names],
+            "sanitize": lambda: [sanitize(s) for s in names],
+            "sanitize_many": lambda: sanitize_many(names),
+        }
+        print(f"  {mix}")
+        baseline = None
+        for label, fn in cases.items():
+            best = min(timeit.repeat(fn, number=1, repeat=repeat))
+            baseline = baseline or best
+            print(f"    {label:<25} {best * 1000:8.2f} ms  ({baseline / best:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
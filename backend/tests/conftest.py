@@ -4,14 +4,24 @@ import pytest
 
 """Test fixtures and helpers for backend tests.
 
-Provides `prepare_db` which sets up a SQLite in-memory engine that is safe to
-share with `TestClient` (uses StaticPool). Tests that need DB access should
-request the `prepare_db` fixture.
+Provides `prepare_db` which sets up a file-backed SQLite database shared by a
+sync engine (StaticPool, safe to share with `TestClient` threads) and an
+aiosqlite async engine used by the request path. Tests that need DB access
+should request the `prepare_db` fixture.
 """
 
+# Each test starts without a forbidden-word matcher, so the first lookup builds
+# one from the settings the test configured instead of rebuilding in the background
+@pytest.fixture(autouse=True)
+def reset_forbidden_words(monkeypatch):
+    from app.services import forbidden_words
+
+    monkeypatch.setattr(forbidden_words, "_state", forbidden_words._State())
+
+
 # Shared DB fixture for tests that need the app DB ready. Tests may request this
-# fixture by name (`prepare_db`) to initialize an in-memory SQLite engine that
-# is safe to share with TestClient threads.
+# fixture by name (`prepare_db`) to initialize a SQLite database that is safe to
+# share with TestClient threads and the async request path.
 @pytest.fixture
 def prepare_db():
     test_db_path = "/tmp/pytest_test.db"
@@ -19,20 +29,43 @@ def prepare_db():
 
     # Import here so the env var is applied and models get registered on Base
     from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
     from sqlalchemy.orm import sessionmaker
-    from sqlalchemy.pool import StaticPool
+    from sqlalchemy.pool import NullPool, StaticPool
 
     import app.db as app_db
 
+    # item_audit tables/writers are cached per engine id; a new engine can reuse a
+    # previous test's id, so drop entries that would point at the deleted database
+    from app.services import audit as audit_service
+
+    audit_service._audit_table_cache.clear()
+    audit_service._audit_writer_cache.clear()
+
+    # ensure stale DB file (possibly from earlier failed runs) is removed
+    try:
+        if os.path.exists(test_db_path):
+            os.remove(test_db_path)
+    except Exception:
+        pass
+
     # create engine that can be used across threads for TestClient
     test_engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{test_db_path}",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    # async engine on the same file; NullPool since each TestClient request runs its own loop
+    test_async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{test_db_path}", poolclass=NullPool
+    )
 
     app_db.engine = test_engine
     app_db.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    app_db.async_engine = test_async_engine
+    app_db.AsyncSessionLocal = async_sessionmaker(
+        bind=test_async_engine, autoflush=False, expire_on_commit=False
+    )
 
     # import models and ensure their metadata/tables are created on the test engine
     import app.models as models_mod
@@ -71,6 +104,7 @@ def prepare_db():
         pass
     yield
     app_db.Base.metadata.drop_all(bind=test_engine)
+    test_engine.dispose()
     try:
         if os.path.exists(test_db_path):
             os.remove(test_db_path)
@@ -0,0 +1,120 @@
+"""Tests for `GET /audit` (filters, keyset pagination and streaming).
+
+Uses the shared `prepare_db` fixture; rows are seeded straight into
+`item_audit` with explicit `created_at` values so ordering is deterministic.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.utils import encode_cursor
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _seed():
+    import app.db as app_db
+    from app.services import audit as audit_service
+
+    audit_table = audit_service._get_or_create_audit_table(app_db.engine)
+    # rows 2 and 3 share a timestamp so the id tie-break is exercised
+    minutes = [0, 1, 2, 2, 4, 5]
+    rows = []
+    for i in range(6):
+        rows.append(
+            {
+                "item_id": i % 3,
+                "action": "create",
+                "payload": {"n": i},
+                "user_id": "alice" if i % 2 == 0 else "bob",
+                "ip": "10.0.0.1",
+                "method": "POST",
+                "created_at": BASE + timedelta(minutes=minutes[i]),
+            }
+        )
+    with app_db.engine.begin() as conn:
+        conn.execute(audit_table.insert(), rows)
+
+
+def _client(monkeypatch):
+    import app.config as conf
+    from app.main import create_app
+
+    monkeypatch.setattr(conf.settings, "AUDIT_API_ENABLED", True, raising=False)
+    return TestClient(create_app())
+
+
+# The endpoint is opt-in: not mounted unless AUDIT_API_ENABLED is set
+def test_audit_api_disabled_by_default(prepare_db, monkeypatch):
+    import app.config as conf
+    from app.main import create_app
+
+    monkeypatch.setattr(conf.settings, "AUDIT_API_ENABLED", False, raising=False)
+    assert TestClient(create_app()).get("/audit").status_code == 404
+
+
+# Filters narrow on typed columns and the created_at range; newest first by default
+def test_audit_filters_and_order(prepare_db, monkeypatch):
+    _seed()
+    client = _client(monkeypatch)
+
+    resp = client.get("/audit", params={"user_id": "alice"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [r["payload"]["n"] for r in body] == [4, 2, 0]
+    assert body[0]["user_id"] == "alice" and body[0]["ip"] == "10.0.0.1"
+
+    resp = client.get(
+        "/audit",
+        params={"since": (BASE + timedelta(minutes=1)).isoformat(), "until": (BASE + timedelta(minutes=3)).isoformat(), "order": "asc"},
+    )
+    assert [r["payload"]["n"] for r in resp.json()] == [1, 2, 3]
+
+    assert [r["payload"]["n"] for r in client.get("/audit", params={"item_id": 1}).json()] == [4, 1]
+
+
+# Following X-Next-Cursor visits every row exactly once, including timestamp ties
+def test_audit_keyset_pagination(prepare_db, monkeypatch):
+    _seed()
+    client = _client(monkeypatch)
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        resp = client.get("/audit", params=params)
+        assert resp.status_code == 200
+        seen.extend(r["payload"]["n"] for r in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        assert 'rel="next"' in resp.headers["Link"]
+        params = {"limit": 2, "after": cursor}
+
+    assert seen == [5, 4, 3, 2, 1, 0]
+    assert client.get("/audit", params={"after": "garbage"}).status_code == 400
+    overflow = encode_cursor({"created_at": BASE.isoformat(), "id": 1e999})
+    assert client.get("/audit", params={"after": overflow}).status_code == 400
+
+
+# stream=true returns every matching row as NDJSON
+def test_audit_stream(prepare_db, monkeypatch):
+    _seed()
+    client = _client(monkeypatch)
+
+    resp = client.get("/audit", params={"stream": "true", "user_id": "bob", "order": "asc"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["payload"]["n"] for r in lines] == [1, 3, 5]
+
+
+# Rows written by POST /items are readable through the API
+def test_audit_reads_rows_written_by_routes(prepare_db, monkeypatch):
+    client = _client(monkeypatch)
+    item_id = client.post("/items", json={"name": "audited"}, headers={"X-User-Id": "carol"}).json()["id"]
+
+    rows = client.get("/audit", params={"user_id": "carol"}).json()
+    assert [r["item_id"] for r in rows] == [item_id]
+    assert rows[0]["created_at"]
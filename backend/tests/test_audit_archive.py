@@ -0,0 +1,137 @@
+"""Tests for the audit archival tool (`app.services.audit_archive`).
+
+Runs against a file-backed SQLite engine: exports a range to gzip NDJSON,
+verifies it against the manifest and deletes only the archived rows.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.services import audit as audit_service
+from app.services import audit_archive
+
+BASE = datetime(2025, 1, 1)
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+    audit_table = audit_service._get_or_create_audit_table(engine)
+    rows = [
+        {
+            "item_id": i,
+            "action": "create",
+            "payload": {"n": i},
+            "user_id": f"u{i}",
+            "created_at": BASE + timedelta(days=i),
+        }
+        for i in range(10)
+    ]
+    with engine.begin() as conn:
+        conn.execute(audit_table.insert(), rows)
+    return engine
+
+
+# Export writes the range in order with a manifest; delete removes only that range
+def test_export_verify_and_delete(tmp_path):
+    engine = _engine(tmp_path)
+    out = str(tmp_path / "out")
+    since, until = BASE + timedelta(days=2), BASE + timedelta(days=7)
+
+    manifest = audit_archive.export_range(engine, since, until, out, formats=("ndjson",), batch_size=2)
+    assert manifest.rows == 5
+    assert [f.format for f in manifest.files] == ["ndjson"]
+
+    with gzip.open(os.path.join(out, manifest.files[0].path), "rt") as fh:
+        lines = [json.loads(line) for line in fh]
+    assert [row["item_id"] for row in lines] == [2, 3, 4, 5, 6]
+    assert lines[0]["payload"] == {"n": 2}
+
+    verified = audit_archive.verify_archive(engine, out)
+    assert verified.max_id == manifest.max_id
+    progress = []
+    assert audit_archive.delete_archived(engine, verified, batch_size=2, on_progress=progress.append) == 5
+    assert progress == [2, 4, 5]
+
+    with engine.connect() as conn:
+        left = [r[0] for r in conn.execute(text("SELECT item_id FROM item_audit ORDER BY id"))]
+    assert left == [0, 1, 7, 8, 9]
+
+
+# A tampered file or a database that no longer matches fails verification
+def test_verify_detects_mismatch(tmp_path):
+    engine = _engine(tmp_path)
+    out = str(tmp_path / "out")
+    manifest = audit_archive.export_range(
+        engine, BASE, BASE + timedelta(days=3), out, formats=("ndjson",)
+    )
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM item_audit WHERE item_id = 0"))
+    with pytest.raises(audit_archive.ArchiveError):
+        audit_archive.verify_archive(engine, out)
+
+    with open(os.path.join(out, manifest.files[0].path), "ab") as fh:
+        fh.write(b"x")
+    with pytest.raises(audit_archive.ArchiveError, match="checksum"):
+        audit_archive.verify_archive(engine, out)
+
+
+# Re-running an interrupted --delete resumes against the original archive, never re-exports
+def test_cli_resumes_interrupted_delete(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    out = tmp_path / "out"
+    argv = [
+        "--database-url", str(engine.url),
+        "--since", BASE.isoformat(),
+        "--until", (BASE + timedelta(days=10)).isoformat(),
+        "--out", str(out),
+        "--format", "ndjson",
+        "--batch-size", "3",
+        "--delete",
+        "--sleep", "0.01",
+    ]
+
+    def interrupt(seconds):
+        raise KeyboardInterrupt
+
+    # stop right after the first delete batch has committed
+    monkeypatch.setattr(audit_archive.time, "sleep", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        audit_archive.main(argv)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM item_audit")).scalar() == 7
+
+    monkeypatch.setattr(audit_archive.time, "sleep", lambda seconds: None)
+    audit_archive.main(argv)
+
+    manifest = audit_archive.ArchiveManifest.load(str(out / audit_archive.MANIFEST_NAME))
+    assert manifest.rows == 10
+    with gzip.open(str(out / manifest.files[0].path), "rt") as fh:
+        assert sorted(json.loads(line)["item_id"] for line in fh) == list(range(10))
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM item_audit")).scalar() == 0
+
+    # exporting into a directory that already holds an archive is refused
+    with pytest.raises(audit_archive.ArchiveError):
+        audit_archive.export_range(engine, BASE, BASE + timedelta(days=1), str(out))
+    with pytest.raises(SystemExit):
+        audit_archive.main(argv[:-3])
+
+
+# With pyarrow installed the same rows are also written as Parquet
+def test_export_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    engine = _engine(tmp_path)
+    out = str(tmp_path / "out")
+
+    manifest = audit_archive.export_range(engine, BASE, BASE + timedelta(days=4), out)
+    parquet = [f for f in manifest.files if f.format == "parquet"][0]
+    table = pq.read_table(os.path.join(out, parquet.path))
+    assert table.num_rows == 4
+    assert table.column("item_id").to_pylist() == [0, 1, 2, 3]
+    audit_archive.verify_archive(engine, out)
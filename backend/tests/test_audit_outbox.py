@@ -0,0 +1,97 @@
+"""Tests for the transactional audit outbox (`app.services.audit_outbox`).
+
+Uses the shared `prepare_db` fixture with `AUDIT_OUTBOX_ENABLED` patched on;
+records are staged by the item routes and moved to `item_audit` by the relay.
+"""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.services.audit_outbox import relay_outbox_once
+
+
+def _counts():
+    import app.db as app_db
+    from app.services.audit import _get_or_create_audit_table
+
+    # item_audit is created lazily on first write
+    _get_or_create_audit_table(app_db.engine)
+    with app_db.engine.connect() as conn:
+        outbox = conn.execute(text("SELECT count(*) FROM audit_outbox")).scalar()
+        audit = conn.execute(text("SELECT count(*) FROM item_audit")).scalar()
+    return outbox, audit
+
+
+# Creating items stages audit records in the outbox instead of item_audit
+def test_routes_stage_records_in_outbox(prepare_db, monkeypatch):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "AUDIT_OUTBOX_ENABLED", True)
+    from app.main import app
+
+    client = TestClient(app)
+    assert client.post("/items", json={"name": "one"}).status_code == 201
+    resp = client.post("/items/batch", json=[{"name": "two"}, {"name": "three"}])
+    assert resp.status_code == 200
+    assert _counts() == (3, 0)
+
+
+# The relay moves staged records to item_audit in bulk and empties the outbox
+def test_relay_moves_records(prepare_db, monkeypatch):
+    import app.config as conf
+    import app.db as app_db
+
+    monkeypatch.setattr(conf.settings, "AUDIT_OUTBOX_ENABLED", True)
+    from app.main import app
+
+    client = TestClient(app)
+    ids = [
+        client.post("/items", json={"name": f"n{i}"}, headers={"X-User-Id": "outboxer"}).json()["id"]
+        for i in range(3)
+    ]
+
+    assert asyncio.run(relay_outbox_once(app_db.async_engine, batch_size=2)) == 2
+    assert _counts() == (1, 2)
+    assert asyncio.run(relay_outbox_once(app_db.async_engine, batch_size=2)) == 1
+    assert _counts() == (0, 3)
+
+    with app_db.engine.connect() as conn:
+        rows = conn.execute(text("SELECT item_id, user_id FROM item_audit ORDER BY id")).fetchall()
+    assert [tuple(r) for r in rows] == [(i, "outboxer") for i in ids]
+
+
+# item_audit.created_at is the staging time, however late the relay runs
+def test_relay_keeps_event_time(prepare_db, monkeypatch):
+    import app.config as conf
+    import app.db as app_db
+
+    monkeypatch.setattr(conf.settings, "AUDIT_OUTBOX_ENABLED", True)
+    monkeypatch.setattr(conf.settings, "AUDIT_API_ENABLED", True, raising=False)
+    from app.main import create_app
+
+    client = TestClient(create_app())
+    assert client.post("/items", json={"name": "late"}).status_code == 201
+    with app_db.engine.begin() as conn:
+        conn.execute(text("UPDATE audit_outbox SET created_at = '2020-01-02 03:04:05'"))
+
+    assert asyncio.run(relay_outbox_once(app_db.async_engine)) == 1
+    resp = client.get("/audit", params={"until": "2020-01-03T00:00:00"})
+    assert [row["created_at"][:19] for row in resp.json()] == ["2020-01-02T03:04:05"]
+
+
+# With the lifespan running, the relay is started and drains the outbox on shutdown
+def test_lifespan_relay_drains_on_shutdown(prepare_db, monkeypatch):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "AUDIT_OUTBOX_ENABLED", True)
+    monkeypatch.setattr(conf.settings, "AUDIT_OUTBOX_RELAY_MS", 60000)
+    from app.main import app
+
+    with TestClient(app) as client:
+        assert app.state.audit_writer is None
+        assert app.state.audit_relay is not None
+        assert client.post("/items", json={"name": "relayed"}).status_code == 201
+
+    assert _counts() == (0, 1)
@@ -0,0 +1,58 @@
+"""Tests for the `item_audit` partition helpers (`app.services.audit_partitions`).
+
+Partition DDL is Postgres-only, so these cover the period arithmetic, naming
+and retention selection that the maintenance command and migration rely on.
+"""
+
+from datetime import date
+
+import pytest
+
+from app.services import audit_partitions as parts
+
+
+# Monthly periods roll over year ends; daily periods over month ends
+def test_period_arithmetic():
+    assert parts.period_start(date(2026, 10, 17), "month") == date(2026, 10, 1)
+    assert parts.next_period(date(2026, 12, 1), "month") == date(2027, 1, 1)
+    assert parts.shift_period(date(2026, 1, 1), "month", -2) == date(2025, 11, 1)
+    assert parts.next_period(date(2026, 2, 28), "day") == date(2026, 3, 1)
+    assert parts.partition_periods(date(2026, 11, 20), date(2027, 1, 3), "month") == [
+        date(2026, 11, 1),
+        date(2026, 12, 1),
+        date(2027, 1, 1),
+    ]
+    with pytest.raises(ValueError):
+        parts.period_start(date(2026, 1, 1), "week")
+
+
+# Names encode the lower bound and round-trip through parse_partition_name
+def test_partition_names_and_ddl():
+    assert parts.partition_name(date(2026, 10, 1), "month") == "item_audit_p2026_10"
+    assert parts.partition_name(date(2026, 10, 17), "day") == "item_audit_p2026_10_17"
+    assert parts.parse_partition_name("item_audit_p2026_10") == (date(2026, 10, 1), "month")
+    assert parts.parse_partition_name("item_audit_p2026_10_17") == (date(2026, 10, 17), "day")
+    assert parts.parse_partition_name("item_audit_default") is None
+
+    sql = parts.create_partition_sql(date(2026, 12, 1), "month")
+    assert "FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')" in sql
+
+
+# Retention keeps the current period plus retention-1 earlier ones
+def test_expired_partitions():
+    names = [
+        "item_audit_default",
+        "item_audit_p2026_07",
+        "item_audit_p2026_08",
+        "item_audit_p2026_09",
+        "item_audit_p2026_10",
+        "item_audit_p2026_11",
+        "item_audit_p2026_08_01",
+    ]
+    today = date(2026, 10, 17)
+    assert parts.expired_partitions(names, today, "month", 2) == [
+        "item_audit_p2026_07",
+        "item_audit_p2026_08",
+    ]
+    assert parts.expired_partitions(names, today, "month", 0) == []
+    assert parts.expired_partitions(names, today, "day", 30) == ["item_audit_p2026_08_01"]
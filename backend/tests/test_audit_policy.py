@@ -0,0 +1,86 @@
+"""Tests for audit policies and sampling (`app.services.audit_policy`).
+
+Route-level tests use the shared `prepare_db` fixture without the lifespan,
+so audit rows are written directly and can be counted right after a request.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.services import audit_policy
+
+
+@pytest.fixture(autouse=True)
+def _reset_policy_stats():
+    audit_policy.reset_stats()
+    yield
+    audit_policy.reset_stats()
+
+
+def _audit_rows():
+    import app.db as app_db
+    from app.services.audit import _get_or_create_audit_table
+
+    _get_or_create_audit_table(app_db.engine)
+    with app_db.engine.connect() as conn:
+        return conn.execute(text("SELECT payload, user_id, user_agent FROM item_audit ORDER BY id")).fetchall()
+
+
+# Per route/method rules override the global rate; "*" matches any path
+def test_sample_rules(monkeypatch):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "AUDIT_SAMPLE_RATE", 0.5)
+    monkeypatch.setattr(conf.settings, "AUDIT_SAMPLE_RULES", "/items:POST=0.1; *:DELETE=0 ;bogus;/x:GET=nan?")
+    assert audit_policy.sample_rate("/items", "post") == 0.1
+    assert audit_policy.sample_rate("/other", "DELETE") == 0.0
+    assert audit_policy.sample_rate("/items/batch", "POST") == 0.5
+
+    assert all(audit_policy.decide("/any", "DELETE") is None for _ in range(20))
+    assert audit_policy.stats() == {"recorded": 0, "sampled_out": 20, "disabled": 0}
+
+
+# AUDIT_ENABLED=0 or AUDIT_POLICY=off skips auditing entirely
+def test_disabled_policy_skips_audit(prepare_db, monkeypatch):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "AUDIT_ENABLED", False)
+    from app.main import app
+
+    client = TestClient(app)
+    assert client.post("/items", json={"name": "quiet"}).status_code == 201
+    monkeypatch.setattr(conf.settings, "AUDIT_ENABLED", True)
+    monkeypatch.setattr(conf.settings, "AUDIT_POLICY", "off")
+    assert client.post("/items/batch", json=[{"name": "a"}, {"name": "b"}]).status_code == 200
+
+    assert _audit_rows() == []
+    assert audit_policy.stats()["disabled"] == 2
+
+
+# metadata keeps the typed columns but drops payload and user_agent
+def test_metadata_policy(prepare_db, monkeypatch):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "AUDIT_POLICY", "metadata")
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.post("/items", json={"name": "meta"}, headers={"X-User-Id": "m", "User-Agent": "ua"})
+    assert resp.status_code == 201
+    assert [tuple(r) for r in _audit_rows()] == [(None, "m", None)]
+
+
+# insert_audit evaluates the policy itself when the caller hasn't
+def test_insert_audit_reports_skipped(monkeypatch):
+    import app.config as conf
+    from sqlalchemy import create_engine
+    from app.services import audit as audit_service
+
+    monkeypatch.setattr(conf.settings, "AUDIT_SAMPLE_RATE", 0.0)
+    engine = create_engine("sqlite://")
+    item = type("D", (), {"id": 1})()
+
+    res = audit_service.insert_audit(None, engine, item, {"method": "POST"})
+    assert res.success is True and res.skipped is True and res.id is None
+    assert audit_service.insert_audit(None, engine, item, {}, verbosity="full").id is not None
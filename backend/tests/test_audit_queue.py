@@ -0,0 +1,78 @@
+"""Tests for the batched audit writer (`app.services.audit_queue`).
+
+Unit tests drive the writer directly on an aiosqlite engine; the last test
+runs the app lifespan (TestClient as a context manager) so queued records
+are drained on shutdown.
+"""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.services.audit_queue import AuditBatchWriter
+
+
+class DummyItem:
+    def __init__(self, id_):
+        self.id = id_
+
+
+async def _count_rows(engine):
+    async with engine.connect() as conn:
+        return (await conn.execute(text("SELECT count(*) FROM item_audit"))).scalar()
+
+
+# Records are written in multi-row flushes and everything is drained on close
+def test_writer_batches_and_drains(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'q.db'}")
+
+    async def run():
+        writer = AuditBatchWriter(engine=engine, batch_size=3, flush_interval_ms=50)
+        await writer.start()
+        for i in range(7):
+            assert await writer.submit(DummyItem(i), {"user_id": f"u{i}"})
+        await writer.close()
+        try:
+            return writer, await _count_rows(engine)
+        finally:
+            await engine.dispose()
+
+    writer, count = asyncio.run(run())
+    assert count == 7
+    assert writer.written == 7
+    assert writer.flushes >= 3
+    assert writer.dropped == 0
+    assert writer.running is False
+
+
+# A full queue drops records (after the put timeout) and counts them
+def test_writer_drops_when_full():
+    async def run():
+        # not started, so nothing drains the queue
+        writer = AuditBatchWriter(max_queue=2, put_timeout_ms=0)
+        results = [await writer.submit(DummyItem(i), {}) for i in range(4)]
+        return writer, results
+
+    writer, results = asyncio.run(run())
+    assert results == [True, True, False, False]
+    assert writer.dropped == 2
+    assert writer.stats()["queued"] == 2
+
+
+# With the lifespan running, POST /items queues the audit row and shutdown flushes it
+def test_lifespan_writer_flushes_on_shutdown(prepare_db):
+    import app.db as app_db
+    from app.main import app
+
+    with TestClient(app) as client:
+        assert app.state.audit_writer.running
+        resp = client.post("/items", json={"name": "queued"}, headers={"X-User-Id": "q-user"})
+        assert resp.status_code == 201
+        item_id = resp.json()["id"]
+
+    assert app.state.audit_writer.running is False
+    with app_db.engine.connect() as conn:
+        row = conn.execute(text("SELECT item_id, user_id FROM item_audit")).fetchone()
+    assert row == (item_id, "q-user")
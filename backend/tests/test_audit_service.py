@@ -70,3 +70,72 @@ def test_insert_audit_sqlite_return_row_and_error():
     bad_engine = object()
     with pytest.raises(audit_service.AuditError):
         audit_service.insert_audit(None, bad_engine, dummy, {}, fail_silent=False)
+
+
+def test_insert_audit_async_sqlite(tmp_path):
+    import asyncio
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    db_path = tmp_path / "audit_async.db"
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    dummy = DummyItem(44, "widget3")
+    payload = {"name": "widget3", "user_id": "tester3", "method": "POST"}
+
+    async def run():
+        try:
+            return await audit_service.insert_audit_async(
+                async_engine, dummy, payload, return_row=True
+            )
+        finally:
+            await async_engine.dispose()
+
+    res = asyncio.run(run())
+    assert res.success is True
+    assert isinstance(res.id, int)
+    assert res.row["item_id"] == 44
+    assert res.row["user_id"] == "tester3"
+    assert res.row["method"] == "POST"
+
+
+def test_audit_writer_is_reused_per_engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    writer = audit_service.get_audit_writer(engine)
+    assert audit_service.get_audit_writer(engine) is writer
+    assert writer.strategy in ("returning", "lastrowid", "inserted_primary_key")
+
+    ids = [
+        audit_service.insert_audit(None, engine, DummyItem(i, "w"), {"user_id": "u"}).id
+        for i in (1, 2)
+    ]
+    assert ids[0] < ids[1]
+
+    # ids come from the insert itself, not a trailing "latest id" SELECT
+    with engine.begin() as conn:
+        first_id, _ = writer.insert(conn, audit_service.build_insert_values(DummyItem(3, "w"), {}))
+        second_id, row = writer.insert(
+            conn, audit_service.build_insert_values(DummyItem(4, "w"), {"ip": "::1"}), return_row=True
+        )
+    assert second_id == first_id + 1
+    assert row["id"] == second_id and row["item_id"] == 4 and row["ip"] == "::1"
+
+
+def test_build_insert_values_compact(monkeypatch):
+    import app.config as conf
+
+    dummy = DummyItem(5, "w")
+    meta = {"name": "w", "user_id": "u", "ip": "1.2.3.4", "user_agent": None, "method": "POST"}
+
+    full = audit_service.build_insert_values(dummy, meta)
+    assert full["payload"] == meta
+
+    compact = audit_service.build_insert_values(dummy, meta, compact=True)
+    assert compact["payload"] == {"name": "w"}
+    assert (compact["user_id"], compact["ip"], compact["method"]) == ("u", "1.2.3.4", "POST")
+
+    monkeypatch.setattr(conf.settings, "AUDIT_PAYLOAD_COMPACT", True)
+    assert audit_service.build_insert_values(dummy, meta)["payload"] == {"name": "w"}
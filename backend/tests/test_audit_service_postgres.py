@@ -6,13 +6,15 @@ If the variable is not set the tests are skipped so CI jobs without Postgres won
 
 The test verifies that:
  - `insert_audit` returns an integer id when using Postgres (RETURNING path), and
- - the backfill SQL path updates rows that only had `payload` populated (columns NULL).
+ - the chunked backfill worker updates rows that only had `payload` populated (columns NULL);
+   `insert_audit` itself no longer touches other rows.
 """
 import os
 import pytest
 from sqlalchemy import create_engine, select, text
 
 from app.services import audit as audit_service
+from app.services import audit_backfill
 
 
 TEST_DSN = os.environ.get("TEST_POSTGRES_DSN")
@@ -45,7 +47,16 @@ def test_insert_audit_postgres_returning_and_backfill():
     assert getattr(res, "success", False) is True, "insert_audit should succeed on Postgres"
     assert isinstance(res.id, int), "insert_audit should return new id on Postgres"
 
-    # The earlier-manual row should have been backfilled by the function's post-insert SQL
+    # insert_audit must not rewrite other rows any more
+    with engine.connect() as conn:
+        sel = select(audit_table.c.user_id).where(audit_table.c.item_id == 1)
+        assert conn.execute(sel).scalar() is None
+
+    # The earlier-manual row is filled in by the backfill worker
+    audit_backfill.reset_watermark(engine)
+    progress = audit_backfill.run_backfill(engine, chunk_size=1)
+    assert progress.done is True
+    assert progress.rows_updated == 1
     with engine.connect() as conn:
         sel = select(audit_table.c.user_id, audit_table.c.ip, audit_table.c.method).where(audit_table.c.item_id == 1)
         row = conn.execute(sel).mappings().first()
@@ -0,0 +1,199 @@
+"""Tests for the forbidden-word automaton (`app.services.forbidden_words`)."""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import forbidden_words
+from app.services.forbidden_words import ForbiddenWordMatcher
+
+
+# Same answers as the naive `word in text` loop, including overlapping words
+def test_matcher_agrees_with_naive_scan():
+    rng = random.Random(7)
+    alphabet = "abc"
+    for _ in range(300):
+        words = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+        text = "".join(rng.choice(alphabet + " ") for _ in range(rng.randint(0, 20)))
+        matcher = ForbiddenWordMatcher(words)
+        found = matcher.find(text)
+        if any(w in text for w in words):
+            assert found in words and found in text
+        else:
+            assert found is None
+
+
+def test_matcher_is_case_insensitive_and_handles_suffix_overlaps():
+    matcher = ForbiddenWordMatcher(["he", "she", "hers", "Spam"])
+    assert matcher.find("uSHErs") in ("she", "he")
+    assert "buy SPAM now" in matcher
+    assert matcher.find("ushr") is None
+    assert ForbiddenWordMatcher([]).find("anything") is None
+    assert ForbiddenWordMatcher(["", "  "]).find("anything") is None
+
+
+def test_word_boundary_mode():
+    matcher = ForbiddenWordMatcher(["ass", "bad word"], mode=forbidden_words.WORD)
+    assert matcher.find("class assignment") is None
+    assert matcher.find("you ass!") == "ass"
+    assert matcher.find("a bad word.") == "bad word"
+    assert matcher.find("a bad words") is None
+    # substring mode (the default) matches inside words
+    assert ForbiddenWordMatcher(["ass"]).find("class") == "ass"
+
+
+def test_unicode_normalized_mode():
+    words = ["spam", "straße"]
+    plain = ForbiddenWordMatcher(words)
+    normalized = ForbiddenWordMatcher(words, normalize=True)
+    assert plain.find("ＳＰＡＭ") is None
+    assert normalized.find("ＳＰＡＭ") == "spam"
+    assert normalized.find("STRASSE") == "strasse"
+
+
+def test_invalid_mode_rejected():
+    with pytest.raises(ValueError):
+        ForbiddenWordMatcher(["x"], mode="regex")
+
+
+def _wait_for_rebuild():
+    import time
+
+    deadline = time.monotonic() + 5
+    while forbidden_words._state.building and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+# Settings changes rebuild the matcher; a words file is merged and reloaded
+def test_get_matcher_rebuilds_from_settings_and_file(monkeypatch, tmp_path):
+    import app.config as conf
+
+    words_file = tmp_path / "words.txt"
+    words_file.write_text("# moderation list\nalpha\n\nbeta  # trailing comment\n", encoding="utf-8")
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", ["gamma"], raising=False)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_FILE", str(words_file), raising=False)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_RELOAD_S", 0, raising=False)
+
+    matcher = forbidden_words.get_matcher()
+    assert sorted(matcher.words) == ["alpha", "beta", "gamma"]
+    assert forbidden_words.get_matcher() is matcher
+
+    words_file.write_text("delta\n", encoding="utf-8")
+    # without polling the file is only re-read on an explicit reload
+    assert forbidden_words.get_matcher() is matcher
+    reloaded = forbidden_words.reload()
+    assert sorted(reloaded.words) == ["delta", "gamma"]
+    assert forbidden_words.get_matcher() is reloaded
+
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_MATCH", "word", raising=False)
+    forbidden_words.get_matcher()
+    _wait_for_rebuild()
+    assert forbidden_words.get_matcher().mode == "word"
+
+
+# A settings change is rebuilt off the request path; the old matcher serves meanwhile
+def test_settings_change_rebuilds_in_background(monkeypatch):
+    import threading
+
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", ["alpha"], raising=False)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_FILE", "", raising=False)
+    matcher = forbidden_words.get_matcher()
+
+    release = threading.Event()
+    real_build = forbidden_words.build_matcher
+
+    def slow_build(**kwargs):
+        release.wait(5)
+        return real_build(**kwargs)
+
+    monkeypatch.setattr(forbidden_words, "build_matcher", slow_build)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", ["beta"], raising=False)
+    assert forbidden_words.get_matcher() is matcher
+    assert forbidden_words.get_matcher() is matcher
+    release.set()
+    _wait_for_rebuild()
+    assert forbidden_words.get_matcher().words == ["beta"]
+
+
+# An unreadable words file on the first build falls back to FORBIDDEN_WORDS
+def test_missing_words_file_falls_back_to_settings(monkeypatch, tmp_path, prepare_db):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", ["spam"], raising=False)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_FILE", str(tmp_path / "missing.txt"), raising=False)
+    monkeypatch.setattr(conf.settings, "VALIDATION_RULES", [("/items", "POST")])
+
+    from app.main import app
+
+    client = TestClient(app)
+    assert client.post("/items", json={"name": "buy spam"}).status_code == 400
+    assert client.post("/items", json={"name": "clean name"}).status_code == 201
+
+
+def test_failed_reload_keeps_previous_matcher(monkeypatch, tmp_path):
+    import app.config as conf
+
+    words_file = tmp_path / "words.txt"
+    words_file.write_text("alpha\n", encoding="utf-8")
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", [], raising=False)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_FILE", str(words_file), raising=False)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_RELOAD_S", 0.001, raising=False)
+    matcher = forbidden_words.get_matcher()
+
+    words_file.unlink()
+    monkeypatch.setattr(forbidden_words._state, "next_check", 0.0)
+    assert forbidden_words.get_matcher() is matcher
+    _wait_for_rebuild()
+    assert forbidden_words.get_matcher() is matcher
+
+
+def test_middleware_uses_words_file(monkeypatch, tmp_path, prepare_db):
+    import app.config as conf
+
+    words_file = tmp_path / "words.txt"
+    words_file.write_text("\n".join(f"term{i}" for i in range(5000)), encoding="utf-8")
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", [], raising=False)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_FILE", str(words_file), raising=False)
+    monkeypatch.setattr(conf.settings, "VALIDATION_RULES", [("/items", "POST")])
+
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.post("/items", json={"name": "contains TERM4321 here"})
+    assert resp.status_code == 400
+    assert client.post("/items", json={"name": "clean name"}).status_code == 201
+
+
+# FORBIDDEN_WORDS_MATCH is case-insensitive; unknown modes stop create_app()
+def test_match_mode_normalized_and_validated_at_startup(monkeypatch):
+    import app.config as conf
+    from app.main import create_app
+
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", ["bad word"], raising=False)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_FILE", "", raising=False)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_MATCH", " Word ", raising=False)
+    create_app()
+    assert forbidden_words.get_matcher().mode == forbidden_words.WORD
+
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_MATCH", "regex", raising=False)
+    with pytest.raises(ValueError, match="FORBIDDEN_WORDS_MATCH"):
+        create_app()
+
+
+# An invalid mode set at runtime keeps the previous matcher and isn't retried
+def test_invalid_mode_at_runtime_keeps_previous_matcher(monkeypatch):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", ["alpha"], raising=False)
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_FILE", "", raising=False)
+    matcher = forbidden_words.get_matcher()
+
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS_MATCH", "regex", raising=False)
+    assert forbidden_words.get_matcher() is matcher
+    _wait_for_rebuild()
+    assert forbidden_words._state.rejected_key == forbidden_words._settings_key()
+    assert forbidden_words.get_matcher() is matcher
+    assert not forbidden_words._state.building
@@ -22,24 +22,33 @@ def prepare_db():
             os.remove(test_db_path)
     except Exception:
         pass
-    # Create a test SQLite in-memory engine that's safe to share across threads
+    # Create test SQLite engines (sync + async) on one file that's safe to share across threads
     from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
     from sqlalchemy.orm import sessionmaker
-    from sqlalchemy.pool import StaticPool
+    from sqlalchemy.pool import NullPool, StaticPool
 
     import app.db as app_db
 
     # create engine that can be used across threads for TestClient
     test_engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{test_db_path}",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    # async engine on the same file for the request path
+    test_async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{test_db_path}", poolclass=NullPool
+    )
     # swap into app.db so application code uses the test engine/session
     app_db.engine = test_engine
     app_db.SessionLocal = sessionmaker(
         autocommit=False, autoflush=False, bind=test_engine
     )
+    app_db.async_engine = test_async_engine
+    app_db.AsyncSessionLocal = async_sessionmaker(
+        bind=test_async_engine, autoflush=False, expire_on_commit=False
+    )
     app_db.Base = app_db.Base
 
     import app.models
@@ -49,6 +58,7 @@ def prepare_db():
     yield
     # teardown
     app_db.Base.metadata.drop_all(bind=test_engine)
+    test_engine.dispose()
     try:
         os.remove(test_db_path)
     except Exception:
@@ -62,12 +72,12 @@ def test_create_item_sanitizes_and_calls_audit(monkeypatch):
 
     called = {}
 
-    def fake_insert_audit(db, engine, db_item, payload_metadata):
+    async def fake_insert_audit(engine, db_item, payload_metadata, **kwargs):
         called["called"] = True
         called["payload"] = payload_metadata
         return 1
 
-    monkeypatch.setattr(audit_service, "insert_audit", fake_insert_audit)
+    monkeypatch.setattr(audit_service, "insert_audit_async", fake_insert_audit)
 
     client = TestClient(app)
 
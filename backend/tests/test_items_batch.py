@@ -0,0 +1,105 @@
+"""Tests for `POST /items/batch`.
+
+Uses the shared `prepare_db` fixture. Checks per-item results, that invalid
+elements don't block valid ones, and that one audit row is written per
+created item.
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+
+# Mixed batch: valid items are created and sanitized, invalid ones reported by index
+def test_batch_create_mixed_results(prepare_db, monkeypatch):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", ["forbidden"])
+    monkeypatch.setattr(
+        conf.settings, "VALIDATION_RULES", [("/items", "POST"), ("/items/batch", "POST")]
+    )
+
+    from app.main import app
+
+    client = TestClient(app)
+    payload = [
+        {"name": "  <b>first</b> "},
+        {"name": ""},
+        {"name": "a forbidden one"},
+        "not-an-object",
+        {"name": "second"},
+    ]
+    resp = client.post("/items/batch", json=payload, headers={"X-User-Id": "batcher"})
+    assert resp.status_code == 200
+    results = resp.json()
+    assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+    assert [r["ok"] for r in results] == [True, False, False, False, True]
+    assert results[0]["item"]["name"] == "first"
+    assert results[4]["item"]["name"] == "second"
+    assert results[0]["item"]["id"] < results[4]["item"]["id"]
+    assert "forbidden" in results[2]["error"].lower()
+
+    listed = client.get("/items").json()
+    assert [row["name"] for row in listed] == ["first", "second"]
+
+    import app.db as app_db
+
+    with app_db.engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT item_id, user_id FROM item_audit ORDER BY id")
+        ).fetchall()
+    assert [r[0] for r in rows] == [results[0]["item"]["id"], results[4]["item"]["id"]]
+    assert all(r[1] == "batcher" for r in rows)
+
+
+# Without a middleware rule for the batch path the route applies the same checks
+def test_batch_create_without_middleware_rule(prepare_db, monkeypatch):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", [])
+    monkeypatch.setattr(conf.settings, "VALIDATION_RULES", [("/items", "POST")])
+
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.post("/items/batch", json=[{"name": " <i>x</i> "}, {"name": 5}])
+    assert resp.status_code == 200
+    results = resp.json()
+    assert results[0]["item"]["name"] == "x"
+    assert results[1]["ok"] is False
+
+
+# Oversized batches and non-array bodies are rejected as a whole
+def test_batch_create_rejects_bad_bodies(prepare_db, monkeypatch):
+    import app.config as conf
+
+    monkeypatch.setattr(
+        conf.settings, "VALIDATION_RULES", [("/items", "POST"), ("/items/batch", "POST")]
+    )
+    monkeypatch.setattr(conf.settings, "ITEMS_BATCH_MAX_SIZE", 2)
+
+    from app.main import app
+
+    client = TestClient(app)
+    too_many = [{"name": f"n{i}"} for i in range(3)]
+    assert client.post("/items/batch", json=too_many).status_code == 400
+    assert client.post("/items", json=[{"name": "list-on-single"}]).status_code == 400
+
+
+# Names that sanitize to nothing are rejected per element, as on POST /items
+def test_batch_rejects_names_empty_after_sanitizing(prepare_db, monkeypatch):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", [])
+    monkeypatch.setattr(
+        conf.settings, "VALIDATION_RULES", [("/items", "POST"), ("/items/batch", "POST")]
+    )
+
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.post("/items/batch", json=[{"name": "<b></b>"}, {"name": "   "}, {"name": "kept"}])
+    assert resp.status_code == 200
+    results = resp.json()
+    assert [r["ok"] for r in results] == [False, False, True]
+    assert all("1-100" in r["error"] for r in results[:2])
+    assert [row["name"] for row in client.get("/items").json()] == ["kept"]
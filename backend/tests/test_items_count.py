@@ -0,0 +1,90 @@
+"""Tests for `GET /items/count` and `HEAD /items` on SQLite.
+
+On SQLite the estimate is the in-process maintained counter, re-seeded from
+an exact count when the cache TTL expires; caches are cleared per test since
+engines are recreated.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(autouse=True)
+def _clear_count_caches():
+    from app.services import item_stats
+
+    item_stats._exact_cache.clear()
+    item_stats._counters.clear()
+    yield
+
+
+def _seed(n):
+    import app.db as app_db
+    import app.models as models
+
+    with app_db.SessionLocal() as s:
+        s.add_all([models.Item(name=f"c-{i}") for i in range(n)])
+        s.commit()
+
+
+# The first estimate seeds the counter exactly; creates keep it current
+def test_count_estimate_tracks_creates(prepare_db):
+    _seed(3)
+    from app.main import app
+
+    client = TestClient(app)
+    assert client.get("/items/count").json() == {"count": 3, "exact": True}
+
+    assert client.post("/items", json={"name": "one more"}).status_code == 201
+    client.post("/items/batch", json=[{"name": "b1"}, {"name": "b2"}])
+    assert client.get("/items/count").json() == {"count": 6, "exact": False}
+
+
+# Creates by other processes are picked up when the counter is re-seeded
+def test_count_estimate_reseeds_after_ttl(prepare_db, monkeypatch):
+    from app.main import app
+    from app.services import item_stats
+
+    monkeypatch.setattr(item_stats.settings, "ITEMS_COUNT_CACHE_TTL", 60)
+    client = TestClient(app)
+    assert client.get("/items/count").json() == {"count": 0, "exact": True}
+    client.post("/items", json={"name": "local"})
+    _seed(2)  # e.g. another worker
+    assert client.get("/items/count").json() == {"count": 1, "exact": False}
+
+    monkeypatch.setattr(item_stats.settings, "ITEMS_COUNT_CACHE_TTL", 0)
+    item_stats._exact_cache.clear()
+    assert client.get("/items/count").json() == {"count": 3, "exact": True}
+
+
+# Exact counts are a snapshot cached for the TTL
+def test_exact_count_is_cached(prepare_db, monkeypatch):
+    from app.main import app
+    from app.services import item_stats
+
+    monkeypatch.setattr(item_stats.settings, "ITEMS_COUNT_CACHE_TTL", 60)
+    client = TestClient(app)
+    assert client.get("/items/count", params={"exact": "true"}).json()["count"] == 0
+
+    # rows written behind the app's back are not seen until the cache expires
+    _seed(2)
+    assert client.get("/items/count", params={"exact": "true"}).json()["count"] == 0
+    client.post("/items", json={"name": "via api"})
+    assert client.get("/items/count", params={"exact": "true"}).json()["count"] == 0
+
+    monkeypatch.setattr(item_stats.settings, "ITEMS_COUNT_CACHE_TTL", 0)
+    item_stats._exact_cache.clear()
+    assert client.get("/items/count", params={"exact": "true"}).json()["count"] == 3
+
+
+# HEAD /items returns the count in headers and no body
+def test_head_items_total_count(prepare_db):
+    _seed(4)
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.head("/items", params={"exact": "true"})
+    assert resp.status_code == 200
+    assert resp.headers["X-Total-Count"] == "4"
+    assert resp.headers["X-Total-Count-Exact"] == "true"
+    assert resp.content == b""
@@ -12,23 +12,39 @@ from fastapi.testclient import TestClient
 def prepare_db():
     # set DATABASE_URL here (fixture runtime) so module import doesn't mutate global env
     os.environ["DATABASE_URL"] = f"sqlite:///{test_db_path}"
-    # Create a test SQLite in-memory engine that's safe to share across threads
+    # Create test SQLite engines (sync + async) on one file that's safe to share across threads
     from sqlalchemy import Table, Column, Integer, String, MetaData, JSON, create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
     from sqlalchemy.orm import sessionmaker
-    from sqlalchemy.pool import StaticPool
+    from sqlalchemy.pool import NullPool, StaticPool
 
     import app.db as app_db
 
+    # ensure stale DB file (possibly from earlier failed runs) is removed so creation can proceed
+    try:
+        if os.path.exists(test_db_path):
+            os.remove(test_db_path)
+    except Exception:
+        pass
+
     test_engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{test_db_path}",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    # async engine on the same file for the request path
+    test_async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{test_db_path}", poolclass=NullPool
+    )
 
     app_db.engine = test_engine
     app_db.SessionLocal = sessionmaker(
         autocommit=False, autoflush=False, bind=test_engine
     )
+    app_db.async_engine = test_async_engine
+    app_db.AsyncSessionLocal = async_sessionmaker(
+        bind=test_async_engine, autoflush=False, expire_on_commit=False
+    )
 
     # Ensure modules that imported `engine` at import-time use the test engine
     try:
@@ -64,6 +80,11 @@ def prepare_db():
     # teardown
     meta.drop_all(bind=test_engine)
     app_db.Base.metadata.drop_all(bind=test_engine)
+    test_engine.dispose()
+    try:
+        os.remove(test_db_path)
+    except Exception:
+        pass
 
 
 def test_forbidden_word_rejected(monkeypatch):
@@ -130,3 +151,27 @@ def test_audit_inserts_typed_columns():
         assert str(payload.get("user_id")) == "int-user"
         assert row[2] == "POST"
         assert "pytest-agent" in (row[3] or "")
+
+
+# A failed commit is a 500: the item isn't reported as created and isn't audited
+def test_commit_failure_returns_500(monkeypatch):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.main import app
+    from app.db import engine
+
+    async def failing_commit(self):
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+    client = TestClient(app)
+    resp = client.post("/items", json={"name": "ghost"})
+    assert resp.status_code == 500
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM items WHERE name = 'ghost'")).scalar() == 0
+        assert (
+            conn.execute(text("SELECT count(*) FROM item_audit WHERE payload LIKE '%ghost%'")).scalar()
+            == 0
+        )
@@ -0,0 +1,60 @@
+"""Tests for `GET /items/search` on SQLite (LIKE fallback path).
+
+Uses the shared `prepare_db` fixture and seeds rows through the sync session.
+"""
+
+from fastapi.testclient import TestClient
+
+
+def _seed(names):
+    import app.db as app_db
+    import app.models as models
+
+    with app_db.SessionLocal() as s:
+        s.add_all([models.Item(name=n) for n in names])
+        s.commit()
+
+
+NAMES = ["Pineapple", "apple pie", "Banana", "Apple", "50%_off"]
+
+
+# Substring search ranks exact, then prefix, then other matches
+def test_search_ranks_exact_then_prefix(prepare_db):
+    _seed(NAMES)
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.get("/items/search", params={"q": "apple"})
+    assert resp.status_code == 200
+    assert [r["name"] for r in resp.json()] == ["Apple", "apple pie", "Pineapple"]
+
+
+# Prefix mode only returns names starting with the query
+def test_search_prefix_mode(prepare_db):
+    _seed(NAMES)
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.get("/items/search", params={"q": "app", "mode": "prefix"})
+    assert [r["name"] for r in resp.json()] == ["Apple", "apple pie"]
+
+
+# LIKE wildcards in the query are matched literally
+def test_search_escapes_wildcards(prepare_db):
+    _seed(NAMES)
+    from app.main import app
+
+    client = TestClient(app)
+    assert [r["name"] for r in client.get("/items/search", params={"q": "%"}).json()] == ["50%_off"]
+    assert [r["name"] for r in client.get("/items/search", params={"q": "_"}).json()] == ["50%_off"]
+
+
+# limit/offset paginate over the ranked result
+def test_search_paginates(prepare_db):
+    _seed(NAMES)
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.get("/items/search", params={"q": "apple", "limit": 1, "offset": 1})
+    assert [r["name"] for r in resp.json()] == ["apple pie"]
+    assert client.get("/items/search", params={"q": "apple", "mode": "fuzzy"}).status_code == 422
@@ -0,0 +1,43 @@
+"""Unit tests for `app.responses`.
+
+The fast encoders must produce the same JSON documents as the stdlib path,
+with and without the optional orjson backend.
+"""
+
+import json
+
+from app import responses
+
+
+class _Obj:
+    def __init__(self, id_, name):
+        self.id = id_
+        self.name = name
+
+
+# dump_items accepts ORM-like objects and dicts and matches json.loads output
+def test_dump_items_matches_stdlib():
+    items = [_Obj(1, "a"), {"id": 2, "name": "ü<b>"}]
+    assert json.loads(responses.dump_items(items)) == [
+        {"id": 1, "name": "a"},
+        {"id": 2, "name": "ü<b>"},
+    ]
+    assert json.loads(responses.dump_item(_Obj(3, "c"))) == {"id": 3, "name": "c"}
+
+
+# dumps falls back to pydantic-core when orjson isn't installed
+def test_dumps_without_orjson(monkeypatch):
+    payload = [{"id": 1, "name": "x"}, {"nested": [1, 2, None]}]
+    fast = responses.dumps(payload)
+    monkeypatch.setattr(responses, "orjson", None)
+    assert json.loads(responses.dumps(payload)) == json.loads(fast) == payload
+
+
+# Response classes set the JSON media type and render via the fast encoders
+def test_response_classes_render():
+    resp = responses.ItemListResponse([_Obj(1, "a")], status_code=200)
+    assert resp.media_type == "application/json"
+    assert json.loads(resp.body) == [{"id": 1, "name": "a"}]
+    created = responses.ItemResponse(_Obj(2, "b"), status_code=201)
+    assert created.status_code == 201
+    assert json.loads(created.body) == {"id": 2, "name": "b"}
@@ -5,9 +5,12 @@ empty-string behavior. These are small, deterministic unit tests that do not
 require DB or network access.
 """
 
+import random
+import re
+
 import pytest
 
-from app.utils import sanitize
+from app.utils import sanitize, sanitize_many
 
 
 # Removes HTML tags
@@ -29,3 +32,48 @@ def test_sanitize_trims_and_collapses_spaces():
 # Empty string remains empty
 def test_sanitize_empty_string():
     assert sanitize("") == ""
+
+
+def _reference_sanitize(s: str) -> str:
+    # the original three-pass implementation; the fast version must match it exactly
+    s = re.sub(r"<[^>]*>", "", s)
+    s = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", s)
+    return re.sub(r"\s+", " ", s).strip()
+
+
+# Edge cases around tags, control/whitespace characters and Unicode spaces
+@pytest.mark.parametrize(
+    "value",
+    [
+        "already clean",
+        " x",
+        "x ",
+        "a  b",
+        "<<a>>b",
+        "a < b",
+        "<a\x00b>c",
+        "a\x1cb\x1dc\x1ed\x1ff",
+        "a\tb\nc\rd\x0be\x0cf",
+        "a\u00a0b\u3000c\u2028d\x85e",
+        "x\u200by",
+        "caf\u00e9 \U0001f600",
+        "\x7f<b>\x00</b> \n ",
+        "",
+    ],
+)
+def test_sanitize_matches_reference(value):
+    assert sanitize(value) == _reference_sanitize(value)
+
+
+def test_sanitize_matches_reference_randomized():
+    rng = random.Random(1234)
+    alphabet = "ab <>/\t\n\r\x00\x01\x0b\x0c\x1c\x1f\x7f\x85\u00a0\u2028\u3000\u00e9"
+    for _ in range(5000):
+        value = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24)))
+        assert sanitize(value) == _reference_sanitize(value), repr(value)
+
+
+def test_sanitize_many():
+    values = ["<b>x</b>", " y  z ", "clean"]
+    assert sanitize_many(values) == [_reference_sanitize(v) for v in values]
+    assert sanitize_many([]) == []
@@ -6,6 +6,8 @@ proxies settings so runtime changes are observed.
 """
 
 import os
+
+import pytest
 from fastapi.testclient import TestClient
 
 
@@ -48,12 +50,272 @@ def test_middleware_and_route_do_not_double_sanitize(monkeypatch, prepare_db):
         calls["count"] += 1
         return s.replace("<b>", "").replace("</b>", "")
 
-    # patch both modules' sanitized references
+    # the route takes the middleware's validated object, so sanitize runs in one place
     monkeypatch.setattr("app.middleware.validation.sanitize", fake_sanitize)
-    monkeypatch.setattr("app.routes.items.sanitize", fake_sanitize)
 
     client = TestClient(app)
     resp = client.post("/items", json={"name": "<b>Hi</b>"})
     assert resp.status_code == 201
+    assert resp.json()["name"] == "Hi"
     # middleware should call sanitize once; route should skip second call
     assert calls["count"] == 1
+
+
+# Unmatched requests reach the app with the original, unbuffered body
+def test_middleware_passes_unmatched_requests_through(prepare_db):
+    import asyncio
+    from app.middleware.validation import ValidationMiddleware
+
+    received = []
+
+    async def app(scope, receive, send):
+        message = await receive()
+        received.append((message["body"], "state" in scope))
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b"not json", "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "path": "/other", "method": "POST", "headers": []}
+    asyncio.run(ValidationMiddleware(app)(scope, receive, send))
+    assert received == [(b"not json", False)]
+
+
+def test_security_headers_added_without_overriding(prepare_db):
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.get("/health")
+    assert resp.headers["x-frame-options"] == "DENY"
+    assert resp.headers["x-content-type-options"] == "nosniff"
+    assert resp.headers["referrer-policy"] == "no-referrer"
+    assert resp.headers["permissions-policy"] == "interest-cohort=()"
+
+    # error responses produced by the validation middleware get them too
+    resp = client.post("/items", content=b"{bad", headers={"content-type": "application/json"})
+    assert resp.status_code == 400
+    assert resp.headers["x-frame-options"] == "DENY"
+
+
+def test_security_headers_keep_existing_values():
+    import asyncio
+    from app.middleware.security import SecurityHeadersMiddleware
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"x-frame-options", b"SAMEORIGIN")]})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(SecurityHeadersMiddleware(app)({"type": "http"}, None, send))
+    headers = sent[0]["headers"]
+    assert [v for k, v in headers if k == b"x-frame-options"] == [b"SAMEORIGIN"]
+    assert (b"x-content-type-options", b"nosniff") in headers
+
+
+# Compiled matcher: exact paths and `*` prefixes, keyed by method
+def test_rule_matcher_exact_and_prefix():
+    from app.middleware.validation import RuleMatcher
+
+    matcher = RuleMatcher([("/items", "POST"), ("/items/*", "PUT"), ("/admin*", "POST"), ("*", "DELETE")])
+    assert matcher.matches("/items", "POST")
+    assert not matcher.matches("/items/1", "POST")
+    assert not matcher.matches("/items", "PUT")
+    assert matcher.matches("/items/", "PUT")
+    assert matcher.matches("/items/1/tags", "PUT")
+    assert matcher.matches("/admin", "POST")
+    assert matcher.matches("/admins/x", "POST")
+    assert not matcher.matches("/adm", "POST")
+    assert matcher.matches("/anything", "DELETE")
+    assert not matcher.matches("/items", "GET")
+
+
+# The compiled config is reused until a setting is reassigned
+def test_rule_matcher_cached_per_settings_snapshot(monkeypatch):
+    import app.config as conf
+    from app.middleware import validation
+
+    monkeypatch.setattr(conf.settings, "VALIDATION_RULES", [("/a", "POST")])
+    first = validation._rule_matcher()
+    assert validation._rule_matcher() is first
+    assert first.matches("/a", "POST")
+
+    monkeypatch.setattr(conf.settings, "VALIDATION_RULES", [("/b", "POST")])
+    second = validation._rule_matcher()
+    assert second is not first
+    assert second.matches("/b", "POST") and not second.matches("/a", "POST")
+
+    monkeypatch.setattr(conf.settings, "VALIDATION_RULES", [])
+    assert validation._rule_matcher().matches("/items/batch", "POST")
+
+
+# The batch helper gives the same per-entry results as validating one by one
+def test_validate_item_payloads_matches_single():
+    from app.middleware.validation import validate_item_payload, validate_item_payloads
+
+    entries = [{"name": " <i>a</i>  b "}, {"name": ""}, "x", {"name": "spam here"}, {"name": "ok"}, {}]
+    assert validate_item_payloads(entries, ["spam"]) == [validate_item_payload(e, ["spam"]) for e in entries]
+    assert validate_item_payloads([], ["spam"]) == []
+
+
+def _run_validation(scope, chunks, monkeypatch, **config):
+    """Drive ValidationMiddleware directly; return (status, receive calls, app called)."""
+    import asyncio
+
+    import app.config as conf
+    from app.middleware.validation import ValidationMiddleware
+
+    monkeypatch.setattr(conf.settings, "VALIDATION_RULES", [("/items", "POST"), ("/items/batch", "POST")])
+    for name, value in config.items():
+        monkeypatch.setattr(conf.settings, name, value, raising=False)
+
+    calls = []
+    sent = []
+    reached = []
+
+    async def receive():
+        i = len(calls)
+        calls.append(i)
+        return {"type": "http.request", "body": chunks[i], "more_body": i < len(chunks) - 1}
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        reached.append(True)
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    scope = {"type": "http", "method": "POST", "headers": [], **scope}
+    asyncio.run(ValidationMiddleware(app)(scope, receive, send))
+    return sent[0]["status"], len(calls), bool(reached)
+
+
+# A declared Content-Length over the limit is rejected without reading the body
+def test_body_limit_rejects_declared_length(monkeypatch):
+    status, reads, reached = _run_validation(
+        {"path": "/items", "headers": [(b"content-length", b"2048")]},
+        [b"x" * 2048],
+        monkeypatch,
+        MAX_BODY_BYTES=1024,
+        BODY_SIZE_LIMITS="",
+    )
+    assert (status, reads, reached) == (413, 0, False)
+
+
+# A streamed body is rejected as soon as it passes the limit, before the rest arrives
+def test_body_limit_rejects_streamed_body_early(monkeypatch):
+    chunks = [b'{"name": "' + b"x" * 400] + [b"x" * 400] * 10 + [b'"}']
+    status, reads, reached = _run_validation({"path": "/items"}, chunks, monkeypatch, MAX_BODY_BYTES=1000, BODY_SIZE_LIMITS="")
+    assert (status, reached) == (413, False)
+    assert reads == 3
+
+
+# Per-route limits override MAX_BODY_BYTES; 0 disables the cap
+def test_body_limit_per_route(monkeypatch):
+    body = [b'{"name": "ok"}']
+    cfg = {"MAX_BODY_BYTES": 0, "BODY_SIZE_LIMITS": "/items:POST=8;*:PUT=1"}
+    assert _run_validation({"path": "/items"}, body, monkeypatch, **cfg)[0] == 413
+    assert _run_validation({"path": "/items/batch"}, [b'[{"name": "ok"}]'], monkeypatch, **cfg)[0] == 204
+
+    cfg = {"MAX_BODY_BYTES": 8, "BODY_SIZE_LIMITS": "/items:POST=64"}
+    assert _run_validation({"path": "/items"}, body, monkeypatch, **cfg)[0] == 204
+
+
+def test_body_limit_through_app(monkeypatch, prepare_db):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "VALIDATION_RULES", [("/items", "POST")])
+    monkeypatch.setattr(conf.settings, "BODY_SIZE_LIMITS", "/items:POST=64", raising=False)
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.post("/items", json={"name": "x" * 100})
+    assert resp.status_code == 413
+    assert "64 bytes" in resp.json()["detail"]
+    assert client.post("/items", json={"name": "short"}).status_code == 201
+
+
+# Single-pass parsing gives the same outcome and details as the dict-based checks
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"name": " <b>hello</b>\n world "},
+        {"name": "x" * 100},
+        {"name": "x" * 101},
+        {"name": ""},
+        {"name": 5},
+        {"name": None},
+        {},
+        {"other": "field"},
+        [],
+        "text",
+        None,
+        {"name": "has spam inside"},
+        {"name": "ok", "extra": 1},
+    ],
+)
+def test_parse_item_json_matches_validate_item_payload(data):
+    import json
+
+    from app.middleware.validation import parse_item_json, validate_item_payload
+
+    item, error = parse_item_json(json.dumps(data).encode(), ["spam"])
+    expected, expected_error = validate_item_payload(data, ["spam"])
+    assert error == expected_error
+    assert (item.name if item is not None else None) == (expected or {}).get("name")
+
+
+def test_parse_item_json_invalid_and_emptied_input():
+    from app.middleware.validation import parse_item_json
+
+    assert parse_item_json(b"{bad", []) == (None, "Invalid JSON body")
+    assert parse_item_json(b"", []) == (None, "`name` is required and must be a string")
+    # sanitizing can empty a name that passed the length check
+    assert parse_item_json(b'{"name": "<b></b>"}', []) == (None, "`name` must be 1-100 characters long")
+
+
+# Without the middleware the dependency parses and sanitizes the body itself
+def test_create_item_dependency_without_middleware(monkeypatch, prepare_db):
+    import app.config as conf
+
+    monkeypatch.setattr(conf.settings, "VALIDATION_RULES", [("/unrelated", "POST")])
+    monkeypatch.setattr(conf.settings, "FORBIDDEN_WORDS", ["spam"])
+    from app.main import app
+
+    client = TestClient(app)
+    resp = client.post("/items", json={"name": "  <i>plain</i>  route "})
+    assert resp.status_code == 201
+    assert resp.json()["name"] == "plain route"
+    resp = client.post("/items", json={"name": "spam"})
+    assert resp.status_code == 400
+    assert client.post("/items", content=b"{bad").status_code == 400
+
+
+# The sanitized body is only encoded when something downstream reads it
+def test_replay_encodes_body_lazily():
+    import asyncio
+
+    from app.middleware.validation import _replay
+
+    encoded = []
+
+    def encode():
+        encoded.append(1)
+        return b'{"name": "x"}'
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    replay = _replay(encode, receive)
+    assert encoded == []
+    first = asyncio.run(replay())
+    assert first["body"] == b'{"name": "x"}' and encoded == [1]
+    assert asyncio.run(replay())["type"] == "http.disconnect"
@@ -0,0 +1,62 @@
+"""Tests for the startup warm-up and the `/health` / `/ready` endpoints.
+
+Lifespan tests use `TestClient` as a context manager so the warm-up runs
+against the shared `prepare_db` database.
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+
+# Without the lifespan the app is alive but not ready
+def test_health_and_ready_without_lifespan(prepare_db):
+    from app.main import create_app
+
+    client = TestClient(create_app())
+    assert client.get("/health").json() == {"status": "ok"}
+    assert client.get("/ready").status_code == 503
+
+
+# Warm-up primes the audit writer cache, leaves no rows behind and flips readiness
+def test_lifespan_warm_up_reports_ready(prepare_db):
+    import app.db as app_db
+    from app.main import app
+    from app.services import audit as audit_service
+
+    with TestClient(app) as client:
+        resp = client.get("/ready")
+        assert resp.status_code == 200 and resp.json() == {"status": "ready"}
+        assert id(app_db.async_engine) in audit_service._audit_writer_cache
+
+    assert app.state.ready is False
+    with app_db.engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM items")).scalar() == 0
+        assert conn.execute(text("SELECT count(*) FROM item_audit")).scalar() == 0
+
+
+# A failed warm-up keeps /ready at 503 and retries in the background
+def test_failed_warm_up_stays_unready(prepare_db, monkeypatch):
+    import app.config as conf
+    from app.main import app
+    from app.services import warmup
+
+    async def broken(app_):
+        raise RuntimeError("database not up yet")
+
+    monkeypatch.setattr(warmup, "warm_up", broken)
+    monkeypatch.setattr(conf.settings, "WARMUP_RETRY_S", 60.0)
+
+    with TestClient(app) as client:
+        assert client.get("/ready").status_code == 503
+        assert client.get("/health").status_code == 200
+        assert app.state.warmup_task is not None
+
+
+# The pool is primed with `size` connections open at the same time
+def test_prime_pool_opens_connections_concurrently(prepare_db):
+    import asyncio
+
+    import app.db as app_db
+    from app.services import warmup
+
+    assert asyncio.run(warmup._prime_pool(app_db.async_engine, 3)) == 3